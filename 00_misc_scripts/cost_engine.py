@@ -0,0 +1,178 @@
+import gzip
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+from llm_cost_estimator import count_tokens, load_pricing
+from jsonl_log_reader import InteractionLogReader
+
+# Pulls timestamp and model out of the line prefix written by JSONLLogger and
+# finds where an (optional) usage object starts, so lines that carry API usage
+# only decode that object instead of running json.loads on the whole entry.
+LINE_RE = re.compile(
+    rb'\{"timestamp": "(\d{4}-\d{2}-\d{2})[^"]*", "model": "((?:[^"\\]|\\.)*)"'
+    rb'(, "usage": )?'
+)
+_decoder = json.JSONDecoder()
+
+# Group for models that have no price (or no tokenizer); their cost is None
+UNPRICED = "unpriced"
+
+
+def _cached_tokens(usage):
+    # OpenAI nests it: {"prompt_tokens_details": {"cached_tokens": 32}}
+    details = usage.get("prompt_tokens_details") or {}
+    return usage.get("cached_tokens") or details.get("cached_tokens") or 0
+
+
+class CostEngine:
+    """
+    Prices full interactions (prompt + cached prompt + completion tokens)
+    from a pricing table that is loaded once, and aggregates cost over the
+    JSONL logs in a single streaming pass.
+    """
+
+    def __init__(self, pricing=None):
+        self.pricing = pricing if pricing is not None else load_pricing()
+        self.malformed_lines = 0  # Lines the last aggregate_logs pass had to skip
+
+    def prices_for(self, model):
+        # LiteLLM style names ("openai/gpt-4o") share the OpenAI price list
+        name = model.split("/", 1)[-1]
+        if name not in self.pricing:
+            raise KeyError(f"Model pricing not found: {model}")
+        return self.pricing[name]
+
+    def cost(self, model, prompt_tokens, completion_tokens=0, cached_tokens=0):
+        """USD cost of one call. `cached_tokens` is the cached part of `prompt_tokens`."""
+        p = self.prices_for(model)
+        uncached = prompt_tokens - cached_tokens
+        return (uncached * p["input"]
+                + cached_tokens * p.get("cached_input", p["input"])
+                + completion_tokens * p["output"]) / 1_000_000
+
+    def aggregate_logs(self, filename="llm_interactions.jsonl", chunk_size=10_000):
+        """
+        One pass over every log segment, grouped by (model, day).
+
+        Memory stays constant: totals are kept per group, and lines without a
+        logged `usage` are tokenized in bounded chunks with the batch encoder.
+        Cost is linear in token counts, so it is computed once per group at the end.
+
+        Models missing from the pricing table (or unknown to tiktoken) are
+        grouped under (UNPRICED, day) with `cost` None and the model names in
+        `models`, instead of aborting the whole pass.
+
+        Lines that cannot be parsed (truncated writes, foreign JSON) are
+        skipped and counted in `self.malformed_lines`. Messages without text
+        (`content` None, e.g. tool calls) count as empty.
+        """
+        totals = defaultdict(lambda: {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                                      "cached_tokens": 0, "models": set()})
+        priced = {}  # model -> whether prices_for knows it
+        pending = []  # (model, day, prompt_text, completion_text) waiting for token counts
+        self.malformed_lines = 0
+
+        for path in InteractionLogReader(filename).segments:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rb") as f:
+                for line in f:
+                    m = LINE_RE.match(line)
+                    if not m:
+                        if line.strip():
+                            self.malformed_lines += 1
+                        continue
+                    day, model = m.group(1).decode(), m.group(2).decode()
+                    if model not in priced:
+                        priced[model] = model.split("/", 1)[-1] in self.pricing
+                    if m.group(3):
+                        try:
+                            usage, _ = _decoder.raw_decode(line[m.end():].decode())
+                        except ValueError:
+                            usage = None
+                        if not isinstance(usage, dict):
+                            self.malformed_lines += 1
+                            continue
+                        group = totals[(model if priced[model] else UNPRICED, day)]
+                        self._add(group, model, usage.get("prompt_tokens", 0),
+                                  usage.get("completion_tokens", 0), _cached_tokens(usage))
+                        continue
+                    if not priced[model]:
+                        self._add(totals[(UNPRICED, day)], model, 0, 0, 0)
+                        continue
+                    try:
+                        messages = json.loads(line)["payload"]["messages"]
+                        prompt = "".join(msg.get("content") or "" for msg in messages if msg.get("role") != "assistant")
+                        completion = "".join(msg.get("content") or "" for msg in messages if msg.get("role") == "assistant")
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        self.malformed_lines += 1
+                        continue
+                    pending.append((model, day, prompt, completion))
+                    if len(pending) >= chunk_size:
+                        self._flush_pending(pending, totals)
+        self._flush_pending(pending, totals)
+
+        for (model, _), group in totals.items():
+            group["models"] = sorted(group["models"])
+            group["cost"] = None if model == UNPRICED else self.cost(
+                model, group["prompt_tokens"], group["completion_tokens"], group["cached_tokens"])
+        return dict(totals)
+
+    def _add(self, group, model, prompt_tokens, completion_tokens, cached_tokens):
+        group["models"].add(model)
+        group["requests"] += 1
+        group["prompt_tokens"] += prompt_tokens
+        group["completion_tokens"] += completion_tokens
+        group["cached_tokens"] += cached_tokens
+
+    def _flush_pending(self, pending, totals):
+        by_model = defaultdict(list)
+        for row in pending:
+            by_model[row[0]].append(row)
+        for model, rows in by_model.items():
+            tokenizer_model = model.split("/", 1)[-1]
+            try:
+                prompt_tokens = count_tokens(tokenizer_model, [r[2] for r in rows])
+                completion_tokens = count_tokens(tokenizer_model, [r[3] for r in rows])
+            except KeyError:
+                # tiktoken cannot map this model to an encoding: tokens unknown
+                for _, day, _, _ in rows:
+                    self._add(totals[(UNPRICED, day)], model, 0, 0, 0)
+                continue
+            for (_, day, _, _), pt, ct in zip(rows, prompt_tokens, completion_tokens):
+                self._add(totals[(model, day)], model, int(pt), int(ct), 0)
+        pending.clear()
+
+
+def benchmark(n=1_000_000, filename="bench_costs.jsonl"):
+    """Lines/sec for a full aggregation pass over a synthetic log with usage data."""
+    from custom_logger_jsonl import JSONLLogger
+
+    with JSONLLogger(filename, buffer_size=10_000, max_bytes=None) as logger:
+        for i in range(n):
+            model = "gpt-4o" if i % 5 == 0 else "my-finetune" if i % 1000 == 999 else "gpt-4o-mini"
+            usage = {"prompt_tokens": 40 + i % 100, "completion_tokens": 120,
+                     "prompt_tokens_details": {"cached_tokens": 32 if i % 3 == 0 else 0}}
+            logger.log("Explain tokens to me.", "Tokens are chunks of text...", model=model, usage=usage)
+
+    engine = CostEngine()
+    start = time.perf_counter()
+    totals = engine.aggregate_logs(filename)
+    elapsed = time.perf_counter() - start
+    os.remove(filename)
+
+    print(f"--- Cost Aggregation ({n:,} lines) ---")
+    for (model, day), t in sorted(totals.items()):
+        cost = "unpriced" if t["cost"] is None else f"${t['cost']:,.4f}"
+        print(f"{day} {model:12} requests={t['requests']:>9,} cost={cost}")
+    print(f"Skipped malformed lines: {engine.malformed_lines}")
+    print(f"Throughput: {n / elapsed:,.0f} lines/sec -> ~{10_000_000 * elapsed / n:.1f}s for 10M lines")
+
+
+if __name__ == "__main__":
+    engine = CostEngine()
+    print(f"gpt-4o, 1,000 prompt (800 cached) + 500 completion tokens: "
+          f"${engine.cost('gpt-4o', 1000, 500, cached_tokens=800):.6f}")
+    benchmark()
@@ -1,37 +1,503 @@
+import asyncio
+import atexit
+import gzip
 import json
-import time
 import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+
 
-def log_to_jsonl(prompt, response, model="gpt-4o-mini"):
+class JSONLLogger:
     """
-    Saves every interaction to a .jsonl file. 
-    This is essential for building custom datasets for fine-tuning.
+    Long-lived JSONL interaction logger.
+
+    Instead of opening the file for every interaction, entries are kept in an
+    in-memory ring buffer and written in one batch when the buffer is full or
+    when `flush_interval` seconds have passed (a small timer thread flushes an
+    idle logger too). The active file is rotated by size and/or age, and closed
+    segments can be gzipped in the background.
     """
-    log_entry = {
+
+    def __init__(self, filename="llm_interactions.jsonl", buffer_size=1000,
+                 flush_interval=5.0, max_bytes=100 * 1024 * 1024,
+                 rotate_interval=None, compress=False):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes                # None = no size-based rotation
+        self.rotate_interval = rotate_interval    # Seconds, None = no time-based rotation
+        self.compress = compress
+
+        # Ring buffer: never grows past buffer_size, we flush before it can overflow
+        self._buffer = deque(maxlen=buffer_size)
+        self._file = None
+        self._opened_at = None
+        self._last_flush = time.monotonic()
+        self.entries_written = 0
+        self._lock = threading.RLock()
+        self._flusher = None                      # Started on the first log()
+        self._stop = threading.Event()
+        self._compressing = []                    # Background gzip threads
+
+        # Make sure nothing buffered is lost when the process exits
+        atexit.register(self.close)
+
+    # --- Writing ---
+
+    def log(self, prompt, response, model="gpt-4o-mini", usage=None):
+        """Buffer one interaction. Disk I/O only happens on flush."""
+        if self._flusher is None:
+            self._start_flusher()
+        self._buffer.append(make_entry(prompt, response, model, usage))
+        if len(self._buffer) >= self.buffer_size or self._flush_due():
+            self.flush()
+
+    def _flush_due(self):
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._flush_loop, name="jsonl-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        # Without this, entries logged just before a quiet period would sit in
+        # the buffer until the next log() call
+        while not self._stop.wait(self.flush_interval):
+            if self._buffer and self._flush_due():
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"[JSONLLogger] timed flush of {self.filename} failed: {e!r}", file=sys.stderr)
+
+    def flush(self):
+        """Serialize everything in the buffer with a single write call."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            lines = []
+            while self._buffer:
+                lines.append(json.dumps(self._buffer.popleft()))
+            self.write_lines(lines)
+
+    def write_lines(self, lines):
+        """Write pre-serialized JSON lines to the active segment (rotating first if needed)."""
+        with self._lock:
+            if self._rotation_due():
+                self.rotate()
+            f = self._open()
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            self.entries_written += len(lines)
+
+    # --- Rotation ---
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, "a", encoding="utf-8")
+            self._opened_at = time.time()
+        return self._file
+
+    def _rotation_due(self):
+        if self.max_bytes is not None and os.path.exists(self.filename):
+            if os.path.getsize(self.filename) >= self.max_bytes:
+                return True
+        if self.rotate_interval is not None and self._opened_at is not None:
+            if time.time() - self._opened_at >= self.rotate_interval:
+                return True
+        return False
+
+    def rotate(self):
+        """
+        Close the active file and move it aside as a timestamped segment.
+
+        With `compress=True` the segment is gzipped by a background thread, so
+        the caller only pays for the rename; the `.gz` path is returned.
+        """
+        with self._lock:
+            return self._rotate()
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return None
+
+        base, ext = os.path.splitext(self.filename)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        # Zero-padded sequence keeps segment names sortable in write order
+        n = 0
+        segment = f"{base}.{stamp}-{n:04d}{ext}"
+        while os.path.exists(segment) or os.path.exists(segment + ".gz"):
+            n += 1
+            segment = f"{base}.{stamp}-{n:04d}{ext}"
+        os.replace(self.filename, segment)
+        # Keep the reader's sidecar index with its segment, never with the new active file
+        if os.path.exists(self.filename + ".idx"):
+            os.replace(self.filename + ".idx", segment + ".idx")
+
+        if self.compress:
+            self._compressing = [t for t in self._compressing if t.is_alive()]
+            t = threading.Thread(target=_compress_segment, args=(segment,), name="jsonl-gzip")
+            t.start()
+            self._compressing.append(t)
+            segment += ".gz"
+        return segment
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        # Let pending compressions finish so no plain segment is left behind
+        for t in self._compressing:
+            t.join()
+        self._compressing = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _compress_segment(segment):
+    """Gzip a closed segment, then drop the plain file and its index."""
+    # Written under a temporary name: readers never see a half-written .gz
+    try:
+        with open(segment, "rb") as src, gzip.open(segment + ".gz.tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(segment + ".gz.tmp", segment + ".gz")
+    except Exception as e:
+        # The plain segment is kept, nothing is lost
+        print(f"[JSONLLogger] compressing {segment} failed: {e!r}", file=sys.stderr)
+        return
+    os.remove(segment)
+    if os.path.exists(segment + ".idx"):
+        os.remove(segment + ".idx")
+
+
+class _WriteErrors:
+    """
+    Counts failed batch writes (bad directory, full disk, permissions) so a
+    writer loop can report them and keep running instead of dying silently.
+    """
+
+    def __init__(self):
+        self.write_errors = 0
+        self.lost = 0
+        self.last_error = None
+
+    def _write(self, writer, lines):
+        try:
+            writer.write_lines(lines)
+        except Exception as e:
+            self.write_errors += 1
+            self.lost += len(lines)
+            self.last_error = e
+            print(f"[{type(self).__name__}] write to {writer.filename} failed: {e!r} "
+                  f"({self.lost} entries lost so far)", file=sys.stderr)
+
+
+class BackgroundJSONLLogger(_WriteErrors):
+    """
+    Queue-backed logger: the caller only enqueues, a dedicated thread does the
+    serialization and disk writes, so a slow disk never adds latency to a request.
+
+    policy="drop"  -> if the queue is full the entry is discarded (counted in `dropped`)
+    policy="block" -> the caller waits until the writer frees up space
+
+    A failed write is counted in `write_errors` / `lost` and reported on
+    stderr; the writer thread keeps running.
+    """
+
+    def __init__(self, filename="llm_interactions.jsonl", max_queue=10_000,
+                 policy="drop", buffer_size=1000, flush_interval=1.0, **logger_kwargs):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        super().__init__()
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._writer = JSONLLogger(filename, buffer_size=buffer_size,
+                                   flush_interval=flush_interval, **logger_kwargs)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    @property
+    def entries_written(self):
+        return self._writer.entries_written
+
+    def log(self, prompt, response, model="gpt-4o-mini", usage=None):
+        entry = make_entry(prompt, response, model, usage)
+        if self.policy == "block":
+            if self._put(entry):
+                return True
+            self.dropped += 1  # The writer is gone: waiting would hang forever
+            return False
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _put(self, item):
+        """Blocking put that gives up (returns False) once the writer thread is dead."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                entry = None
+            if entry is _STOP:
+                break
+            if entry is not None:
+                batch.append(json.dumps(entry))
+            if len(batch) >= self.buffer_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write(self._writer, batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self._write(self._writer, batch)
+
+    def close(self):
+        """Drain the queue, stop the writer thread and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._put(_STOP):
+            self._thread.join()
+        try:
+            self._writer.close()
+        except Exception as e:
+            self.last_error = e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncJSONLLogger(_WriteErrors):
+    """
+    asyncio flavour for `litellm.acompletion` code paths.
+
+    `await logger.alog(...)` only touches an asyncio.Queue; a writer task hands
+    batches to a worker thread with `asyncio.to_thread`, so the event loop is
+    never blocked on disk. Must be created inside a running event loop.
+
+    Call `await logger.aclose()` (or use `async with`) before the loop ends.
+    If that is skipped, whatever is still queued is written by an atexit hook.
+    """
+
+    def __init__(self, filename="llm_interactions.jsonl", max_queue=10_000,
+                 policy="drop", buffer_size=1000, flush_interval=1.0, **logger_kwargs):
+        if policy not in ("drop", "block"):
+            raise ValueError("policy must be 'drop' or 'block'")
+        super().__init__()
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._writer = JSONLLogger(filename, buffer_size=buffer_size,
+                                   flush_interval=flush_interval, **logger_kwargs)
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._batch = []  # Serialized, not yet handed to the writer thread
+        self._closed = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        atexit.register(self._close_at_exit)
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    @property
+    def entries_written(self):
+        return self._writer.entries_written
+
+    async def alog(self, prompt, response, model="gpt-4o-mini", usage=None):
+        entry = make_entry(prompt, response, model, usage)
+        if self.policy == "block":
+            if self._task.done():
+                self.dropped += 1  # The writer is gone: waiting would hang forever
+                return False
+            await self._queue.put(entry)
+            return True
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while True:
+            try:
+                entry = await asyncio.wait_for(self._queue.get(),
+                                               timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                entry = None
+            if entry is _STOP:
+                break
+            if entry is not None:
+                self._batch.append(json.dumps(entry))
+            if len(self._batch) >= self.buffer_size or loop.time() >= deadline:
+                if self._batch:
+                    batch, self._batch = self._batch, []
+                    await asyncio.to_thread(self._write, self._writer, batch)
+                deadline = loop.time() + self.flush_interval
+        if self._batch:
+            batch, self._batch = self._batch, []
+            await asyncio.to_thread(self._write, self._writer, batch)
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        if not self._task.done():
+            await self._queue.put(_STOP)
+            await self._task
+        await asyncio.to_thread(self._writer.close)
+
+    def _close_at_exit(self):
+        # The event loop is gone by now: drain the queue and write synchronously
+        if self._closed:
+            return
+        self._closed = True
+        while not self._queue.empty():
+            entry = self._queue.get_nowait()
+            if entry is not _STOP:
+                self._batch.append(json.dumps(entry))
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._write(self._writer, batch)
+        self._writer.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# Sentinel used to tell writer loops to drain and stop
+_STOP = object()
+
+
+def make_entry(prompt, response, model="gpt-4o-mini", usage=None):
+    entry = {
         "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
         "model": model,
-        "payload": {
-            "messages": [
-                {"role": "user", "content": prompt},
-                {"role": "assistant", "content": response}
-            ]
-        }
     }
-    
-    filename = "llm_interactions.jsonl"
-    with open(filename, "a") as f:
-        f.write(json.dumps(log_entry) + "\n")
-    
-    print(f"Logged interaction to {filename}")
+    # Optional token usage reported by the API, e.g.
+    # {"prompt_tokens": 12, "completion_tokens": 30, "cached_tokens": 0}.
+    # Kept ahead of the payload so readers can pick it out of the line prefix.
+    if usage is not None:
+        entry["usage"] = usage
+    entry["payload"] = {
+        "messages": [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": response}
+        ]
+    }
+    return entry
+
+
+_default_logger = None
+
+def log_to_jsonl(prompt, response, model="gpt-4o-mini", usage=None):
+    """
+    Saves every interaction to a .jsonl file.
+    This is essential for building custom datasets for fine-tuning.
+
+    Uses a shared buffered JSONLLogger, so the file is not reopened per call.
+    """
+    global _default_logger
+    if _default_logger is None:
+        _default_logger = JSONLLogger()
+    _default_logger.log(prompt, response, model, usage)
+
+
+# --- Benchmark ---
+
+def benchmark(n=100_000, filename="bench_interactions.jsonl"):
+    """Compare entries/sec of open-per-call logging vs the buffered logger."""
+    p = "Tell me a joke."
+    r = "Why did the AI cross the road? To get to the other dataset."
+
+    start = time.perf_counter()
+    with open(filename, "w"):
+        pass
+    for _ in range(n):
+        with open(filename, "a") as f:
+            f.write(json.dumps(make_entry(p, r)) + "\n")
+    naive = n / (time.perf_counter() - start)
+    os.remove(filename)
+
+    start = time.perf_counter()
+    with JSONLLogger(filename, max_bytes=None) as logger:
+        for _ in range(n):
+            logger.log(p, r)
+    buffered = n / (time.perf_counter() - start)
+    os.remove(filename)
+
+    print(f"--- Logging Throughput ({n:,} entries) ---")
+    print(f"Open/append per call: {naive:12,.0f} entries/sec")
+    print(f"Buffered logger:      {buffered:12,.0f} entries/sec ({buffered / naive:.1f}x)")
+
+    # Caller-side latency is what matters for the background writer
+    with BackgroundJSONLLogger(filename, max_queue=n, max_bytes=None) as logger:
+        start = time.perf_counter()
+        for _ in range(n):
+            logger.log(p, r)
+        enqueue = n / (time.perf_counter() - start)
+    os.remove(filename)
+    print(f"Background enqueue:   {enqueue:12,.0f} entries/sec (dropped: {logger.dropped})")
+
 
 if __name__ == "__main__":
     # Simulate an interaction
     p = "Tell me a joke."
     r = "Why did the AI cross the road? To get to the other dataset."
-    
-    log_to_jsonl(p, r)
-    
-    # Read back to show user
+
+    with JSONLLogger("llm_interactions.jsonl") as logger:
+        logger.log(p, r)
+    print("Logged interaction to llm_interactions.jsonl")
+
+    # Read back to show user (streams entries instead of loading the whole file)
+    from jsonl_log_reader import InteractionLogReader
     print("\nCurrent Log Content:")
-    with open("llm_interactions.jsonl", "r") as f:
-        print(f.read())
+    for entry in InteractionLogReader("llm_interactions.jsonl").iter_entries():
+        print(json.dumps(entry))
+
+    benchmark()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+
+class FakeLLMServer:
+    """
+    Tiny OpenAI-compatible /v1/chat/completions server for local tests and benchmarks.
+
+    Point LiteLLM or the OpenAI client at `server.base_url` (model "openai/fake-model")
+    and no real API calls are made. Supports `stream=True` (SSE), a fixed response
+    latency, per-token delay for streams, and a random 429 rate to exercise retries.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, token_delay=0.01,
+                 error_rate=0.0, reply_words=30, seed=0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.reply_words = reply_words
+        self.requests = 0
+        self.rng = random.Random(seed)
+        self._server = None
+        self._handlers = set()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # --- HTTP handling (keep-alive, one request at a time per connection) ---
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._respond(writer, request_line.decode(), json.loads(body or b"{}"))
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _respond(self, writer, request_line, payload):
+        self.requests += 1
+        if "/chat/completions" not in request_line:
+            self._send(writer, 404, {"error": {"message": "not found"}})
+            return await writer.drain()
+        if self.rng.random() < self.error_rate:
+            self._send(writer, 429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}})
+            return await writer.drain()
+
+        await asyncio.sleep(self.latency)
+        prompt = " ".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        words = [f"word{i}" for i in range(self.reply_words)]
+        model = payload.get("model", "fake-model")
+        if payload.get("stream"):
+            await self._stream(writer, model, words)
+        else:
+            self._send(writer, 200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": " ".join(words)}}],
+                "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(words),
+                          "total_tokens": len(prompt.split()) + len(words)},
+            })
+        await writer.drain()
+
+    def _send(self, writer, status, obj):
+        body = json.dumps(obj).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+
+    async def _stream(self, writer, model, words):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n\r\n")
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        def event(delta, finish_reason=None):
+            data = json.dumps({"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                               "model": model, "choices": [{"index": 0, "delta": delta,
+                                                            "finish_reason": finish_reason}]})
+            return f"data: {data}\n\n".encode()
+
+        def chunk(data):
+            return f"{len(data):x}\r\n".encode() + data + b"\r\n"
+
+        writer.write(chunk(event({"role": "assistant", "content": ""})))
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.token_delay)
+            writer.write(chunk(event({"content": word if i == 0 else " " + word})))
+            await writer.drain()
+        writer.write(chunk(event({}, "stop")))
+        writer.write(chunk(b"data: [DONE]\n\n"))
+        writer.write(b"0\r\n\r\n")
+
+
+async def _serve_forever(port):
+    async with FakeLLMServer(port=port) as server:
+        print(f"Fake LLM server listening on {server.base_url} (Ctrl+C to stop)")
+        await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    asyncio.run(_serve_forever(8000))
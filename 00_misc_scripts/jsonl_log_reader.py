@@ -0,0 +1,239 @@
+import glob
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+
+import numpy as np
+
+# Sidecar index layout (<segment>.idx):
+#   MAGIC | uint32 header length | JSON header | packed records
+# Each record is (byte offset, line length, timestamp as YYYYMMDDHHMMSS, model id).
+# The header identifies the indexed file (inode, mtime, hash of the first line)
+# so a rotated or rewritten file is never read through a stale index.
+MAGIC = b"JLIDX2\n"
+RECORD = np.dtype([("offset", "<u8"), ("length", "<u4"), ("ts", "<u8"), ("model", "<u2")])
+
+# JSONLLogger writes "timestamp" and "model" first, so both can be pulled out of
+# the line prefix without running json.loads on the whole entry.
+PREFIX_RE = re.compile(rb'\{"timestamp": "([0-9: -]{19})", "model": "((?:[^"\\]|\\.)*)"')
+
+
+def _ts_key(value):
+    """'2026-10-18 09:30:00' (str/bytes) or a datetime -> 20261018093000."""
+    if hasattr(value, "strftime"):
+        value = value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, bytes):
+        value = value.decode()
+    return int(re.sub(r"\D", "", value).ljust(14, "0")[:14])
+
+
+def _first_line_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.readline(4096)).hexdigest()[:16]
+
+
+class LogIndex:
+    """
+    Offset index for one uncompressed JSONL segment.
+
+    `records` is a numpy structured array (RECORD) mapped straight from the
+    .idx file, so opening the index of a 10M-line segment costs no parsing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.idx_path = path + ".idx"
+        self.models = []
+        self.records = np.empty(0, dtype=RECORD)
+        self.size = 0
+        self._mm = None
+
+    def load_or_build(self):
+        stat = os.stat(self.path)
+        identity = {"inode": stat.st_ino, "first_line": _first_line_hash(self.path)}
+        header = self._load() if os.path.exists(self.idx_path) else None
+        if header is not None and header.get("identity") == identity and self.size <= stat.st_size:
+            if self.size == stat.st_size and header.get("mtime_ns") == stat.st_mtime_ns:
+                return self  # Unchanged
+            if self.size < stat.st_size:
+                new = self._scan_from(self.size)  # Lines were appended to the active segment
+                self.records = np.concatenate([self.records, new])
+                self._save(identity, stat.st_mtime_ns)
+                return self
+        # Missing, rotated, truncated or rewritten: index from scratch
+        self.close()
+        self.models, self.size = [], 0
+        self.records = self._scan_from(0)
+        self._save(identity, stat.st_mtime_ns)
+        return self
+
+    def _load(self):
+        """Maps the index file; returns its header, or None if the file is not a valid index."""
+        with open(self.idx_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (hlen,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(hlen))
+            start = len(MAGIC) + 4 + hlen
+            count = (os.fstat(f.fileno()).st_size - start) // RECORD.itemsize
+            if count:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.records = np.frombuffer(self._mm, dtype=RECORD, count=count, offset=start)
+        self.models = header["models"]
+        self.size = header["size"]
+        return header
+
+    def _scan_from(self, start):
+        """Indexes the complete lines from byte `start` on; returns the new records."""
+        model_ids = {m: i for i, m in enumerate(self.models)}
+        size = os.path.getsize(self.path)
+        rows = []
+        if size == 0:
+            return np.array(rows, dtype=RECORD)
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    break  # Partial trailing line still being written
+                m = PREFIX_RE.match(mm, pos, end)
+                if m:
+                    model = m.group(2).decode()
+                    if model not in model_ids:
+                        model_ids[model] = len(self.models)
+                        self.models.append(model)
+                    rows.append((pos, end - pos, _ts_key(m.group(1)), model_ids[model]))
+                pos = end + 1
+            self.size = pos
+        return np.array(rows, dtype=RECORD)
+
+    def _save(self, identity, mtime_ns):
+        header = json.dumps({"models": self.models, "size": self.size,
+                             "identity": identity, "mtime_ns": mtime_ns}).encode()
+        tmp = self.idx_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            f.write(self.records.data)
+        self.close()
+        os.replace(tmp, self.idx_path)
+        self._load()
+
+    def select(self, lo, hi, model_id=None):
+        """(offset, length) of the records in [lo, hi], optionally for one model id."""
+        records = self.records
+        mask = (records["ts"] >= lo) & (records["ts"] <= hi)
+        if model_id is not None:
+            mask &= records["model"] == model_id
+        return records["offset"][mask], records["length"][mask]
+
+    def close(self):
+        self.records = np.empty(0, dtype=RECORD)  # Drop the view before unmapping
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class InteractionLogReader:
+    """
+    Reads the segments produced by JSONLLogger (active file + rotated segments).
+
+    Uncompressed segments are memory-mapped and filtered through their sidecar
+    index, so only the lines that match a time range / model are ever parsed.
+    Gzipped segments cannot be mapped; they are streamed and filtered on the
+    line prefix instead.
+    """
+
+    def __init__(self, filename="llm_interactions.jsonl"):
+        base, ext = os.path.splitext(filename)
+        plain = glob.glob(f"{glob.escape(base)}.*{ext}")
+        # A segment still being compressed in the background exists in both forms: read the plain one
+        gzipped = [p for p in glob.glob(f"{glob.escape(base)}.*{ext}.gz") if p[:-3] not in plain]
+        rotated = sorted(plain + gzipped)
+        self.segments = rotated + ([filename] if os.path.exists(filename) else [])
+
+    def iter_entries(self, start=None, end=None, model=None):
+        """Yield parsed log entries, oldest first, matching the optional filters."""
+        lo = _ts_key(start) if start is not None else 0
+        hi = _ts_key(end) if end is not None else 99999999999999
+        for path in self.segments:
+            if path.endswith(".gz"):
+                yield from self._iter_gzip(path, lo, hi, model)
+            else:
+                yield from self._iter_mapped(path, lo, hi, model)
+
+    def _iter_mapped(self, path, lo, hi, model):
+        index = LogIndex(path).load_or_build()
+        try:
+            model_id = index.models.index(model) if model in index.models else None
+            if not len(index.records) or (model is not None and model_id is None):
+                return
+            offsets, lengths = index.select(lo, hi, model_id)
+        finally:
+            index.close()
+        if not len(offsets):
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset, length in zip(offsets.tolist(), lengths.tolist()):
+                yield json.loads(mm[offset:offset + length])
+
+    def _iter_gzip(self, path, lo, hi, model):
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                m = PREFIX_RE.match(line)
+                if not m or not lo <= _ts_key(m.group(1)) <= hi:
+                    continue
+                if model is not None and m.group(2).decode() != model:
+                    continue
+                yield json.loads(line)
+
+    def iter_training_examples(self, **filters):
+        """
+        Convert `payload.messages` into the {"text": ...} rows that
+        05_fine_tuning/02_training_script_example.py trains on.
+        """
+        for entry in self.iter_entries(**filters):
+            parts = []
+            for msg in entry["payload"]["messages"]:
+                role = "Human" if msg["role"] == "user" else "Assistant" if msg["role"] == "assistant" else "System"
+                parts.append(f"### {role}: {msg['content']}")
+            yield {"text": "\n".join(parts)}
+
+    def export_training_jsonl(self, out_path, **filters):
+        """Stream training rows to a JSONL file; returns the number of rows written."""
+        count = 0
+        with open(out_path, "w", encoding="utf-8") as out:
+            for row in self.iter_training_examples(**filters):
+                out.write(json.dumps(row) + "\n")
+                count += 1
+        return count
+
+
+if __name__ == "__main__":
+    from custom_logger_jsonl import JSONLLogger
+
+    # Build a small demo log with a couple of rotated segments
+    with JSONLLogger("demo_interactions.jsonl", max_bytes=50_000) as logger:
+        for i in range(2000):
+            model = "gpt-4o" if i % 4 == 0 else "gpt-4o-mini"
+            logger.log(f"Question #{i}", f"Answer #{i}", model=model)
+            if i % 500 == 0:
+                logger.flush()
+
+    reader = InteractionLogReader("demo_interactions.jsonl")
+    print(f"Segments: {reader.segments}")
+
+    start = time.perf_counter()
+    n = sum(1 for _ in reader.iter_entries(model="gpt-4o"))
+    print(f"gpt-4o entries: {n} ({(time.perf_counter() - start) * 1000:.1f} ms, index built)")
+
+    start = time.perf_counter()
+    n = sum(1 for _ in reader.iter_entries(model="gpt-4o"))
+    print(f"gpt-4o entries: {n} ({(time.perf_counter() - start) * 1000:.1f} ms, index reused)")
+
+    rows = reader.export_training_jsonl("finetune_dataset.jsonl", start="2000-01-01 00:00:00")
+    print(f"Wrote {rows} training rows to finetune_dataset.jsonl")
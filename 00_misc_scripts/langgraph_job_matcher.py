@@ -1,5 +1,7 @@
 import os
-from typing import TypedDict, Optional, List
+import operator
+import time
+from typing import Annotated, TypedDict, Optional, List
 from dotenv import load_dotenv
 
 # LangGraph & LangChain imports
@@ -7,9 +9,10 @@ from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
-# Import our Pydantic models from the modules folder
-from modules.job import Job
-from modules.resume import Resume
+# Import our Pydantic models from the shared_models package (pip install -e ../shared_models)
+from shared_models.job import Job
+from shared_models.resume import Resume
+from shared_models.extraction_cache import ExtractionCache
 
 # Load environment variables
 load_dotenv()
@@ -22,39 +25,60 @@ class AgentState(TypedDict):
     structured_job: Optional[Job]
     structured_resume: Optional[Resume]
     fit_analysis: Optional[str]
+    # Seconds spent in each node. Parallel branches write different keys,
+    # so the dicts are merged with `|` instead of overwriting each other.
+    timings: Annotated[dict, operator.or_]
 
 # Create our LLM with Structured Output capability
 # We use gpt-4o-mini as a smart, low-cost model
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
+# Persistent cache of extraction results: the same raw text (after whitespace
+# normalization) is only sent to the LLM once per schema version
+extraction_cache = ExtractionCache()
+
 # --- Define the Nodes (The "Workers" of our Graph) ---
 
-def extraction_node(state: AgentState):
+# The Job and Resume extractions are independent, so they run as two
+# parallel branches (a LangGraph fan-out) instead of one after the other.
+# Node latency becomes max(job, resume) instead of job + resume.
+
+def job_extraction_node(state: AgentState):
     """
-    This node takes raw text and uses the LLM to 'extract' data 
-    into our structured Job and Resume Pydantic models.
+    This node takes the raw job text and uses the LLM to 'extract' data
+    into our structured Job Pydantic model.
     """
-    print("\n--- NODE: EXTRACTOR ---")
-    
-    # 1. Extract Job Data
+    print("\n--- NODE: JOB EXTRACTOR ---")
+    start = time.perf_counter()
+
     job_extractor = llm.with_structured_output(Job)
-    job_data = job_extractor.invoke([
+    job_data = extraction_cache.get_or_extract(Job, state['raw_job_text'], lambda: job_extractor.invoke([
         HumanMessage(content=f"Extract structured job information from this text: {state['raw_job_text']}")
-    ])
-    
-    # 2. Extract Resume Data
+    ]))
+
+    print(f"Successfully extracted Job: {job_data.title} at {job_data.company}")
+    return {
+        "structured_job": job_data,
+        "timings": {"job_extraction": time.perf_counter() - start}
+    }
+
+def resume_extraction_node(state: AgentState):
+    """
+    This node takes the raw resume text and uses the LLM to 'extract' data
+    into our structured Resume Pydantic model.
+    """
+    print("\n--- NODE: RESUME EXTRACTOR ---")
+    start = time.perf_counter()
+
     resume_extractor = llm.with_structured_output(Resume)
-    resume_data = resume_extractor.invoke([
+    resume_data = extraction_cache.get_or_extract(Resume, state['raw_resume_text'], lambda: resume_extractor.invoke([
         HumanMessage(content=f"Extract structured resume information from this text: {state['raw_resume_text']}")
-    ])
-    
-    print(f"Successfully extracted Job: {job_data.title} at {job_data.company}")
+    ]))
+
     print(f"Successfully extracted Resume for: {resume_data.name}")
-    
-    # Return updates to the state
     return {
-        "structured_job": job_data, 
-        "structured_resume": resume_data
+        "structured_resume": resume_data,
+        "timings": {"resume_extraction": time.perf_counter() - start}
     }
 
 def matcher_node(state: AgentState):
@@ -62,6 +86,7 @@ def matcher_node(state: AgentState):
     This node compares the structured job and resume to see if there's a match.
     """
     print("\n--- NODE: MATCHER ---")
+    start = time.perf_counter()
     job = state["structured_job"]
     resume = state["structured_resume"]
     
@@ -85,7 +110,7 @@ def matcher_node(state: AgentState):
     analysis = llm.invoke(prompt).content
     
     print("Match Analysis Complete.")
-    return {"fit_analysis": analysis}
+    return {"fit_analysis": analysis, "timings": {"matcher": time.perf_counter() - start}}
 
 # --- Build the Graph ---
 
@@ -93,13 +118,15 @@ def matcher_node(state: AgentState):
 workflow = StateGraph(AgentState)
 
 # 2. Add our nodes to the graph
-workflow.add_node("extractor", extraction_node)
+workflow.add_node("job_extractor", job_extraction_node)
+workflow.add_node("resume_extractor", resume_extraction_node)
 workflow.add_node("matcher", matcher_node)
 
 # 3. Define the edges (The "Paths")
-workflow.add_edge(START, "extractor")   # Start at extractor
-workflow.add_edge("extractor", "matcher") # Then go to matcher
-workflow.add_edge("matcher", END)        # Then finish
+workflow.add_edge(START, "job_extractor")     # Fan out: both extractors
+workflow.add_edge(START, "resume_extractor")  # start in the same super-step
+workflow.add_edge(["job_extractor", "resume_extractor"], "matcher")  # Join: wait for both
+workflow.add_edge("matcher", END)              # Then finish
 
 # 4. Compile the Graph into a runnable Application
 app = workflow.compile()
@@ -126,10 +153,13 @@ if __name__ == "__main__":
     print("🚀 Starting LangGraph Job Matcher...")
     
     # Invoke the app with initial state
+    start = time.perf_counter()
     final_output = app.invoke({
         "raw_job_text": raw_job,
-        "raw_resume_text": raw_resume
+        "raw_resume_text": raw_resume,
+        "timings": {}
     })
+    total = time.perf_counter() - start
 
     print("\n" + "="*50)
     print("🎯 FINAL MATCH ANALYSIS")
@@ -139,3 +169,11 @@ if __name__ == "__main__":
     print("-" * 30)
     print(final_output['fit_analysis'])
     print("="*50)
+
+    # Show the speedup from running both extractions in parallel
+    t = final_output["timings"]
+    sequential = t["job_extraction"] + t["resume_extraction"]
+    parallel = max(t["job_extraction"], t["resume_extraction"])
+    print(f"⏱️ Job extraction: {t['job_extraction']:.2f}s | Resume extraction: {t['resume_extraction']:.2f}s")
+    print(f"⏱️ Extraction stage: {parallel:.2f}s in parallel vs {sequential:.2f}s sequential")
+    print(f"⏱️ Total graph time: {total:.2f}s")
@@ -4,13 +4,18 @@ import asyncio
 import getpass
 import os
 
+from custom_logger_jsonl import AsyncJSONLLogger
+
 if not os.environ.get("OPENAI_API_KEY"):
     os.environ["OPENAI_API_KEY"] = getpass.getpass("Enter your OpenAI API key: ")
 
 async def test_get_response():
     user_message = "Hello, how are you?"
     messages = [{"content": user_message, "role": "user"}]
-    response = await acompletion(model="openai/gpt-4o", messages=messages)
+    # Logging only enqueues; the disk write happens off the event loop
+    async with AsyncJSONLLogger(policy="drop") as logger:
+        response = await acompletion(model="openai/gpt-4o", messages=messages)
+        await logger.alog(user_message, response.choices[0].message.content, model="openai/gpt-4o")
     return response
 
 response = asyncio.run(test_get_response())
@@ -1,33 +1,218 @@
+import asyncio
 import os
-from litellm import completion
+import random
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from types import SimpleNamespace
+
+from litellm import completion, acompletion
 from dotenv import load_dotenv
 
+from llm_cost_estimator import PRICING, get_encoding
+
 load_dotenv()
 
+
+class LatencyWindow:
+    """
+    Rolling stats for one model, as read by ModelRouter.score: p95 latency over
+    a recent window plus an EWMA of the error rate.
+
+    The window is also kept sorted (insert/remove by bisection on each record),
+    so reading p95 on every routing decision is a lookup, not a sort.
+    """
+
+    def __init__(self, size=200, alpha=0.1, prior_latency=1.0):
+        self.samples = deque(maxlen=size)  # Arrival order, to know which sample leaves next
+        self._sorted = []
+        self.alpha = alpha
+        self.ewma_error = 0.0
+        self.prior_latency = prior_latency
+
+    def record(self, latency, error=False):
+        if len(self.samples) == self.samples.maxlen:
+            del self._sorted[bisect_left(self._sorted, self.samples[0])]
+        self.samples.append(latency)
+        insort(self._sorted, latency)
+        self.ewma_error += self.alpha * ((1.0 if error else 0.0) - self.ewma_error)
+
+    def percentile(self, q):
+        if not self._sorted:
+            return self.prior_latency
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+    @property
+    def p95(self):
+        return self.percentile(0.95)
+
+
+class ModelRouter:
+    """
+    Routes each prompt to the model with the best cost/latency trade-off.
+
+    - Complexity is measured in tokens (cached tiktoken encoder), not characters.
+      Prompts at or above `complex_tokens` get a quality penalty on non-"strong" models.
+    - Each model keeps a LatencyWindow; slow or failing models score worse.
+    - A small `explore` rate keeps stats fresh for models that are not currently winning.
+    """
+
+    def __init__(self, models=None, complex_tokens=20, cost_weight=0.2, latency_weight=1.0,
+                 error_weight=5.0, quality_penalty=10.0, explore=0.05, seed=None,
+                 completion_fn=completion, acompletion_fn=acompletion, tokenizer_model="gpt-4o"):
+        # name -> {"price": input $ per 1M tokens, "strong": bool}
+        self.models = models or {
+            "openai/gpt-4o-mini": {"price": PRICING["gpt-4o-mini"]["input"], "strong": False},
+            "openai/gpt-4o": {"price": PRICING["gpt-4o"]["input"], "strong": True},
+        }
+        self.complex_tokens = complex_tokens
+        self.cost_weight = cost_weight
+        self.latency_weight = latency_weight
+        self.error_weight = error_weight
+        self.quality_penalty = quality_penalty
+        self.explore = explore
+        self.stats = {name: LatencyWindow() for name in self.models}
+        self._rng = random.Random(seed)
+        self._completion = completion_fn
+        self._acompletion = acompletion_fn
+        self._encoding = get_encoding(tokenizer_model)
+
+    def complexity(self, prompt):
+        return len(self._encoding.encode_ordinary(prompt))
+
+    def score(self, name, tokens):
+        cfg, stats = self.models[name], self.stats[name]
+        score = (cfg["price"] * self.cost_weight
+                 + stats.p95 * self.latency_weight
+                 + stats.ewma_error * self.error_weight)
+        if tokens >= self.complex_tokens and not cfg["strong"]:
+            score += self.quality_penalty
+        return score
+
+    def choose(self, prompt):
+        tokens = self.complexity(prompt)
+        if self._rng.random() < self.explore:
+            return self._rng.choice(list(self.models)), tokens
+        return min(self.models, key=lambda name: self.score(name, tokens)), tokens
+
+    def route(self, prompt):
+        model, tokens = self.choose(prompt)
+        start = time.perf_counter()
+        try:
+            response = self._completion(model=model, messages=[{"role": "user", "content": prompt}])
+        except Exception:
+            self.stats[model].record(time.perf_counter() - start, error=True)
+            raise
+        self.stats[model].record(time.perf_counter() - start)
+        return model, response.choices[0].message.content
+
+    async def aroute(self, prompt):
+        model, tokens = self.choose(prompt)
+        start = time.perf_counter()
+        try:
+            response = await self._acompletion(model=model, messages=[{"role": "user", "content": prompt}])
+        except Exception:
+            self.stats[model].record(time.perf_counter() - start, error=True)
+            raise
+        self.stats[model].record(time.perf_counter() - start)
+        return model, response.choices[0].message.content
+
+
+_router = None
+
 def model_router(prompt):
     """
     Simulates a logic-based model router.
-    - Short/Simple prompts go to a cheap model (GPT-3.5 or Llama).
-    - Complex/Long prompts go to an expensive model (GPT-4).
+    - Short/Simple prompts go to a cheap model (GPT-4o-mini).
+    - Complex/Long prompts (by token count) go to an expensive model (GPT-4o),
+      unless observed latency/errors make the other model the better trade-off.
     """
+    global _router
+    if _router is None:
+        _router = ModelRouter()
     print(f"\nRouting Prompt: '{prompt[:40]}...'")
-    
-    # Logic: If prompt > 50 chars, use expensive model
-    if len(prompt) > 50:
-        model = "openai/gpt-4o"
-        print(">> Decision: COMPLEX -> Using GPT-4o")
-    else:
-        model = "openai/gpt-4o-mini" # Or "groq/llama-3.1-70b-versatile"
-        print(">> Decision: SIMPLE -> Using GPT-4o-mini")
-        
-    response = completion(model=model, messages=[{"role": "user", "content": prompt}])
-    return response.choices[0].message.content
+    model, content = _router.route(prompt)
+    print(f">> Decision: {model}")
+    return content
+
+
+# --- Fake-backend benchmark ---
+
+class FakeBackend:
+    """
+    Simulated LLM latencies (scaled down 100x so the benchmark runs in seconds).
+    gpt-4o-mini degrades halfway through: 30% of its calls become very slow.
+    """
+
+    def __init__(self, degraded_after=None, seed=0, scale=0.01):
+        self.rng = random.Random(seed)
+        self.scale = scale
+        self.calls = 0
+        self.degraded_after = degraded_after
+
+    async def acompletion(self, model, messages):
+        self.calls += 1
+        if model.endswith("mini"):
+            latency = self.rng.gauss(0.4, 0.05)
+            if self.degraded_after is not None and self.calls > self.degraded_after and self.rng.random() < 0.3:
+                latency = self.rng.gauss(4.0, 0.5)
+        else:
+            latency = self.rng.gauss(1.0, 0.1)
+        await asyncio.sleep(max(0.0, latency) * self.scale)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+
+async def _run_benchmark(choose_async, prompts, concurrency=20):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(p):
+        async with sem:
+            start = time.perf_counter()
+            await choose_async(p)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(p) for p in prompts))
+    latencies.sort()
+    return latencies
+
+
+def benchmark(n=2000):
+    short = ["Hello!", "What is 2+2?", "Translate 'cat' to French."]
+    long = ["Explain the theory of general relativity in the style of a pirate and "
+            "provide 3 mathematical equations with a derivation for each of them."]
+    rng = random.Random(1)
+    prompts = [rng.choice(short) if rng.random() < 0.8 else long[0] for _ in range(n)]
+
+    def pct(lat, q):
+        return lat[min(len(lat) - 1, int(q * len(lat)))] * 1000
+
+    # Static rule: len(prompt) > 50 -> gpt-4o
+    backend = FakeBackend(degraded_after=n // 2)
+
+    async def static(p):
+        model = "openai/gpt-4o" if len(p) > 50 else "openai/gpt-4o-mini"
+        return await backend.acompletion(model=model, messages=[{"role": "user", "content": p}])
+
+    static_lat = asyncio.run(_run_benchmark(static, prompts))
+
+    backend = FakeBackend(degraded_after=n // 2)
+    # Latencies are scaled down, so scale the latency weight up to match real seconds
+    router = ModelRouter(acompletion_fn=backend.acompletion, latency_weight=1.0 / backend.scale, seed=0)
+    routed_lat = asyncio.run(_run_benchmark(router.aroute, prompts))
+
+    print(f"--- Router Benchmark ({n:,} requests, mini degrades halfway) ---")
+    for label, lat in (("Static len>50", static_lat), ("ModelRouter", routed_lat)):
+        print(f"{label:14} p50={pct(lat, 0.5):6.1f}ms  p95={pct(lat, 0.95):6.1f}ms  p99={pct(lat, 0.99):6.1f}ms")
+
 
 if __name__ == "__main__":
     # Test 1: Simple
     res1 = model_router("Hello!")
     print(f"Result: {res1}")
-    
+
     # Test 2: Complex
     res2 = model_router("Explain the theory of general relativity in the style of a pirate and provide 3 mathematical equations.")
     print(f"Result: {res2[:100]}...")
+
+    benchmark()
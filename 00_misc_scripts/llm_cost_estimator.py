@@ -1,19 +1,34 @@
+import json
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
 import tiktoken
 
+PRICING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pricing.json")
+
+@lru_cache(maxsize=None)
+def load_pricing(path=PRICING_FILE):
+    """Prices per 1M tokens, read from pricing.json once per process."""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    return {model: prices for model, prices in table.items() if not model.startswith("_")}
+
+PRICING = load_pricing()
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name):
+    """Process-wide tokenizer cache: the BPE tables are loaded once per model."""
+    return tiktoken.encoding_for_model(model_name)
+
 def estimate_cost(model_name, prompt):
-    # Prices per 1M tokens (Approximate values)
-    pricing = {
-        "gpt-4o": {"input": 5.00, "output": 15.00},
-        "gpt-4o-mini": {"input": 0.15, "output": 0.60}
-    }
-    
-    encoding = tiktoken.encoding_for_model(model_name)
+    encoding = get_encoding(model_name)
     tokens = len(encoding.encode(prompt))
-    
-    if model_name in pricing:
-        price_per_1k = pricing[model_name]["input"] / 1000 # Cost for 1k tokens
-        total_cost = (tokens / 1_000_000) * pricing[model_name]["input"]
-        
+
+    if model_name in PRICING:
+        total_cost = (tokens / 1_000_000) * PRICING[model_name]["input"]
+
         print(f"--- Cost Estimate for {model_name} ---")
         print(f"Tokens: {tokens}")
         print(f"Estimated Input Cost: ${total_cost:8f}")
@@ -22,7 +37,47 @@ def estimate_cost(model_name, prompt):
         print("Model pricing not found.")
         return 0
 
+def count_tokens(model_name, prompts, num_threads=8):
+    """Token count per prompt using tiktoken's multi-threaded batch encoder."""
+    encoding = get_encoding(model_name)
+    encoded = encoding.encode_ordinary_batch(list(prompts), num_threads=num_threads)
+    return np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+
+def estimate_costs(model_name, prompts, num_threads=8):
+    """
+    Batch version of estimate_cost (input tokens only, no printing).
+    Returns per-prompt token counts and costs as NumPy arrays plus the total.
+    """
+    if model_name not in PRICING:
+        raise KeyError(f"Model pricing not found: {model_name}")
+    tokens = count_tokens(model_name, prompts, num_threads=num_threads)
+    costs = tokens * (PRICING[model_name]["input"] / 1_000_000)
+    return {"tokens": tokens, "costs": costs, "total_cost": float(costs.sum())}
+
+def benchmark(model_name="gpt-4o-mini", n=20_000):
+    """prompts/sec: one tiktoken.encoding_for_model + encode per prompt vs the batch API."""
+    prompts = [f"Explain the history of the internet in great detail, part {i}." for i in range(n)]
+
+    start = time.perf_counter()
+    for p in prompts:
+        len(tiktoken.encoding_for_model(model_name).encode(p))
+    single = n / (time.perf_counter() - start)
+
+    get_encoding(model_name)  # Warm the cache so we time encoding, not loading
+    start = time.perf_counter()
+    estimate_costs(model_name, prompts)
+    batch = n / (time.perf_counter() - start)
+
+    print(f"--- Token Counting Throughput ({n:,} prompts, {model_name}) ---")
+    print(f"Single call: {single:12,.0f} prompts/sec")
+    print(f"Batch API:   {batch:12,.0f} prompts/sec ({batch / single:.1f}x)")
+
 if __name__ == "__main__":
     p = "Explain the history of the internet in great detail. I need at least 5 paragraphs."
     estimate_cost("gpt-4o", p)
     estimate_cost("gpt-4o-mini", p)
+
+    result = estimate_costs("gpt-4o-mini", [p, "Hello!", "Summarize this article."])
+    print(f"\nBatch tokens: {result['tokens']}, total cost: ${result['total_cost']:.8f}")
+
+    benchmark()
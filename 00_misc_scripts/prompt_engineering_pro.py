@@ -2,15 +2,23 @@ import os
 from openai import OpenAI
 from dotenv import load_dotenv
 
+# pip install -e ../llm_cache
+from llm_cache import CachedChatCompletions, ResponseCache, SQLiteCache
+
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Kept next to this script (not in the cwd); the file is only created on first use
+cache_path = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"))
+# Repeated deterministic (temperature=0) prompts are served from memory/disk
+chat = CachedChatCompletions(client, ResponseCache(disk=SQLiteCache(cache_path)))
 
 def demo_chain_of_thought():
     print("--- 1. Chain of Thought (CoT) ---")
     prompt = "A jug holds 5 liters of water. I pour out 2 liters, then add 4. How much is left? Think step by step."
-    response = client.chat.completions.create(
+    response = chat.create(
         model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0
     )
     print(response.choices[0].message.content)
 
@@ -25,15 +33,16 @@ Report: [UI] Unexpected background-color: blue on /login; expected: green.
 
 User: I can't see the logout button on mobile.
 Report:"""
-    response = client.chat.completions.create(
+    response = chat.create(
         model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0
     )
     print(response.choices[0].message.content)
 
 def demo_system_constraints():
     print("\n--- 3. System Constraints ---")
-    response = client.chat.completions.create(
+    response = chat.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a grumpy sailor. Answer in exactly 10 words, no more, no less."},
@@ -47,3 +56,4 @@ if __name__ == "__main__":
     demo_chain_of_thought()
     demo_few_shot()
     demo_system_constraints()
+    print(f"\nCache stats: {chat.cache.snapshot()}")
@@ -0,0 +1,337 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# --- Upstream: where the tokens come from ---
+
+def openai_upstream(client, model="gpt-4o-mini"):
+    """Wraps `client.chat.completions.create(stream=True)` as an async iterator of text deltas."""
+    async def upstream(messages, **params):
+        stream = await client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    return upstream
+
+
+# --- Metrics ---
+
+class StreamMetrics:
+    """Time-to-first-token and inter-token latency over the most recent streams."""
+
+    def __init__(self, window=1000):
+        self.ttft = deque(maxlen=window)
+        self.inter_token = deque(maxlen=window * 10)
+        self.streams = 0
+        self.frames = 0
+        self.deltas = 0
+        self.active_clients = 0
+        self.slow_clients_dropped = 0
+        self.upstream_errors = 0
+
+    @staticmethod
+    def _pct(samples, q):
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    def snapshot(self):
+        return {
+            "streams": self.streams,
+            "active_clients": self.active_clients,
+            "deltas": self.deltas,
+            "frames": self.frames,
+            "slow_clients_dropped": self.slow_clients_dropped,
+            "upstream_errors": self.upstream_errors,
+            "ttft_ms_p50": self._pct(self.ttft, 0.5),
+            "ttft_ms_p95": self._pct(self.ttft, 0.95),
+            "inter_token_ms_p50": self._pct(self.inter_token, 0.5),
+            "inter_token_ms_p95": self._pct(self.inter_token, 0.95),
+        }
+
+
+# --- Per-client buffering ---
+
+class SlowConsumer(Exception):
+    pass
+
+
+class ClientBuffer:
+    """
+    Bounded outgoing buffer for one SSE client.
+
+    Up to `max_frames` frames are queued; after that new text is merged into the
+    last queued frame so no tokens are lost. If the client falls more than
+    `max_bytes` behind it is disconnected instead of growing memory forever.
+    """
+
+    def __init__(self, max_frames=64, max_bytes=256 * 1024):
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.frames = deque()
+        self.size = 0
+        self.closed = False
+        self.error = None
+        self._ready = asyncio.Event()
+
+    def put(self, text):
+        if len(self.frames) < self.max_frames:
+            self.frames.append(text)
+        else:
+            self.frames[-1] += text
+        self.size += len(text)
+        if self.size > self.max_bytes:
+            raise SlowConsumer(f"client is {self.size} bytes behind")
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self):
+        """Next frame, or None once the buffer is closed and drained."""
+        while not self.frames:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        text = self.frames.popleft()
+        self.size -= len(text)
+        return text
+
+
+# --- Server ---
+
+class SSEStreamingServer:
+    """
+    asyncio HTTP server that relays `stream=True` LLM output to SSE clients.
+
+    POST /v1/stream   body: {"messages": [...], ...extra completion params}
+    GET  /stream?q=.. shortcut for a single user message
+    GET  /metrics     JSON metrics snapshot
+
+    Tiny deltas are coalesced into one SSE frame every `frame_interval` seconds
+    or once `frame_max_chars` characters are pending, whichever comes first.
+    """
+
+    def __init__(self, upstream, host="127.0.0.1", port=0, frame_interval=0.02,
+                 frame_max_chars=64, client_max_frames=64, client_max_bytes=256 * 1024):
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.frame_interval = frame_interval
+        self.frame_max_chars = frame_max_chars
+        self.client_max_frames = client_max_frames
+        self.client_max_bytes = client_max_bytes
+        self.metrics = StreamMetrics()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            method, target, _ = (await reader.readline()).decode().split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode().partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            url = urlparse(target)
+            if url.path == "/metrics":
+                return await self._send_json(writer, 200, self.metrics.snapshot())
+            if method == "POST" and url.path == "/v1/stream":
+                try:
+                    params = json.loads(body or b"{}")
+                except ValueError:
+                    return await self._send_json(writer, 400, {"error": "body is not valid JSON"})
+                messages = params.pop("messages", None) if isinstance(params, dict) else None
+                if not isinstance(messages, list) or not messages or not all(isinstance(m, dict) for m in messages):
+                    return await self._send_json(writer, 400, {"error": "body needs a non-empty 'messages' list"})
+            elif method == "GET" and url.path == "/stream":
+                params = {}
+                messages = [{"role": "user", "content": parse_qs(url.query).get("q", [""])[0]}]
+            else:
+                return await self._send_json(writer, 404, {"error": "not found"})
+            await self._serve_stream(writer, messages, params)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send_json(self, writer, status, obj):
+        body = json.dumps(obj).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _serve_stream(self, writer, messages, params):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        buffer = ClientBuffer(self.client_max_frames, self.client_max_bytes)
+        self.metrics.active_clients += 1
+        self.metrics.streams += 1
+        producer = asyncio.create_task(self._produce(messages, params, buffer))
+        try:
+            # The socket drain is the backpressure: a slow client just lets its buffer grow
+            while (frame := await buffer.get()) is not None:
+                writer.write(f"data: {json.dumps({'delta': frame})}\n\n".encode())
+                await writer.drain()
+                self.metrics.frames += 1
+            if buffer.error:
+                writer.write(f"event: error\ndata: {json.dumps({'error': buffer.error})}\n\n".encode())
+            else:
+                writer.write(b"event: done\ndata: {}\n\n")
+            await writer.drain()
+        finally:
+            producer.cancel()
+            self.metrics.active_clients -= 1
+
+    async def _produce(self, messages, params, buffer):
+        """Reads upstream deltas and pushes coalesced frames into the client buffer."""
+        deltas = asyncio.Queue()
+        reader = asyncio.create_task(self._read_upstream(messages, params, deltas))
+        loop = asyncio.get_running_loop()
+        pending, pending_since = "", None
+        try:
+            while True:
+                timeout = None if pending_since is None else max(0.0, pending_since + self.frame_interval - loop.time())
+                try:
+                    delta = await asyncio.wait_for(deltas.get(), timeout)
+                except asyncio.TimeoutError:
+                    delta = ""
+                if delta is None:
+                    break
+                if isinstance(delta, Exception):
+                    # Deliver what arrived, then end with `event: error` instead of `done`
+                    if pending:
+                        buffer.put(pending)
+                        pending = ""
+                    self.metrics.upstream_errors += 1
+                    buffer.error = f"upstream failed: {delta!r}"
+                    break
+                if delta:
+                    if pending_since is None:
+                        pending_since = loop.time()
+                    pending += delta
+                if pending and (len(pending) >= self.frame_max_chars
+                                or loop.time() - pending_since >= self.frame_interval):
+                    buffer.put(pending)
+                    pending, pending_since = "", None
+            if pending:
+                buffer.put(pending)
+        except SlowConsumer as e:
+            self.metrics.slow_clients_dropped += 1
+            buffer.frames.clear()
+            buffer.error = str(e)
+        finally:
+            reader.cancel()
+            buffer.close()
+
+    async def _read_upstream(self, messages, params, deltas):
+        start = last = time.perf_counter()
+        first = True
+        try:
+            async for delta in self.upstream(messages, **params):
+                now = time.perf_counter()
+                if first:
+                    self.metrics.ttft.append(now - start)
+                    first = False
+                else:
+                    self.metrics.inter_token.append(now - last)
+                last = now
+                self.metrics.deltas += 1
+                deltas.put_nowait(delta)
+        except Exception as e:
+            deltas.put_nowait(e)  # Reported to the client by _produce
+        else:
+            deltas.put_nowait(None)
+
+
+# --- Local benchmark against the fake streaming backend ---
+
+async def _read_sse(url, path="/stream?q=hello", read_delay=0.0):
+    """Minimal SSE client: returns (time to first frame, frames, text)."""
+    parsed = urlparse(url)
+    reader, writer = await asyncio.open_connection(parsed.hostname, parsed.port)
+    start = time.perf_counter()
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {parsed.hostname}\r\n\r\n".encode())
+    await writer.drain()
+    first, frames, text = None, 0, ""
+    while line := await reader.readline():
+        if line.startswith(b"data: {\"delta\""):
+            if first is None:
+                first = time.perf_counter() - start
+            frames += 1
+            text += json.loads(line[6:])["delta"]
+            if read_delay:
+                await asyncio.sleep(read_delay)
+    writer.close()
+    return first, frames, text
+
+
+async def _benchmark(clients=200):
+    from fake_llm_server import FakeLLMServer
+
+    async with FakeLLMServer(latency=0.05, token_delay=0.005, reply_words=100) as backend:
+        client = AsyncOpenAI(base_url=backend.base_url, api_key="fake-key")
+        upstream = openai_upstream(client, model="fake-model")
+        async with SSEStreamingServer(upstream) as server:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(_read_sse(server.url) for _ in range(clients)),
+                                           _read_sse(server.url, read_delay=0.05))
+            elapsed = time.perf_counter() - start
+            first = sorted(r[0] for r in results if r[0] is not None)
+            print(f"--- SSE Relay ({clients} concurrent clients + 1 slow client) ---")
+            print(f"Wall time: {elapsed:.2f}s, frames/client: {sum(r[1] for r in results) / len(results):.1f}"
+                  f" (100 upstream deltas each)")
+            print(f"Client time-to-first-frame p50={first[len(first) // 2] * 1000:.1f}ms "
+                  f"p95={first[int(len(first) * 0.95)] * 1000:.1f}ms")
+            print(f"Server metrics: {server.metrics.snapshot()}")
+
+
+async def _serve_forever(port):
+    from stream_fanout import FanOutUpstream
+
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Identical concurrent requests share one upstream stream
+    upstream = FanOutUpstream(openai_upstream(client), model="gpt-4o-mini")
+    async with SSEStreamingServer(upstream, port=port) as server:
+        print(f"SSE server on {server.url}/stream?q=Write+a+3-sentence+story (Ctrl+C to stop)")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import sys
+    if "--serve" in sys.argv:
+        asyncio.run(_serve_forever(8080))
+    else:
+        asyncio.run(_benchmark())
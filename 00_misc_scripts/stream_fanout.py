@@ -0,0 +1,152 @@
+import asyncio
+import json
+import random
+import time
+
+
+class SharedStream:
+    """
+    One upstream LLM stream that any number of subscribers can follow.
+
+    Every delta is kept in `tokens`, so a subscriber that joins late first
+    replays what was already emitted and then continues live.
+    """
+
+    def __init__(self, source, on_finish):
+        self.tokens = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self._on_finish = on_finish
+        self._task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source):
+        try:
+            async for delta in source:
+                self.tokens.append(delta)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = RuntimeError("upstream stream cancelled")
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._notify()
+            self._on_finish(self)
+
+    def _notify(self):
+        # Wake everyone waiting on the current event, then start a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def subscribe(self):
+        """
+        Counts the subscriber right away, so a stream that was handed out but
+        not iterated yet is not cancelled when another subscriber leaves.
+        """
+        self.subscribers += 1
+        return self._follow()
+
+    async def _follow(self):
+        i = 0
+        try:
+            while True:
+                changed = self._changed
+                while i < len(self.tokens):
+                    yield self.tokens[i]
+                    i += 1
+                if self.done:
+                    if self.error:
+                        raise self.error
+                    return
+                await changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                # Nobody is listening any more: stop paying for the upstream. Forget
+                # the stream now, not when the cancellation lands, so a request
+                # arriving in between starts a fresh upstream instead of joining this one.
+                self._on_finish(self)
+                self._task.cancel()
+
+
+class FanOutUpstream:
+    """
+    Request coalescing for streaming calls.
+
+    Wraps an upstream (an async-iterator factory such as `openai_upstream(...)`
+    from sse_streaming_server.py) and attaches identical in-flight
+    (model, messages, params) requests to a single upstream stream. Finished
+    streams are forgotten, so this coalesces bursts rather than caching answers.
+    """
+
+    def __init__(self, upstream, model=None):
+        self.upstream = upstream
+        self.model = model
+        self.in_flight = {}
+        self.upstream_calls = 0
+        self.requests = 0
+        self.coalesced = 0
+
+    def _key(self, messages, params):
+        return json.dumps({"model": self.model, "messages": messages, "params": params},
+                          sort_keys=True, default=str)
+
+    def __call__(self, messages, **params):
+        self.requests += 1
+        key = self._key(messages, params)
+        shared = self.in_flight.get(key)
+        if shared is None:
+            self.upstream_calls += 1
+            shared = SharedStream(self.upstream(messages, **params),
+                                  on_finish=lambda s, key=key: self._forget(key, s))
+            self.in_flight[key] = shared
+        else:
+            self.coalesced += 1
+        return shared.subscribe()
+
+    def _forget(self, key, shared):
+        if self.in_flight.get(key) is shared:
+            del self.in_flight[key]
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+        }
+
+
+async def _benchmark(clients=200, distinct_prompts=5, arrival_window=0.3):
+    from openai import AsyncOpenAI
+    from fake_llm_server import FakeLLMServer
+    from sse_streaming_server import SSEStreamingServer, openai_upstream, _read_sse
+
+    rng = random.Random(0)
+    arrivals = [(rng.uniform(0, arrival_window), rng.randrange(distinct_prompts)) for _ in range(clients)]
+
+    async def client(url, delay, prompt_id):
+        await asyncio.sleep(delay)
+        return await _read_sse(url, path=f"/stream?q=popular+question+{prompt_id}")
+
+    print(f"--- Streaming Fan-out ({clients} clients, {distinct_prompts} distinct prompts, "
+          f"arrivals over {arrival_window * 1000:.0f}ms) ---")
+    for fan_out in (False, True):
+        async with FakeLLMServer(latency=0.05, token_delay=0.01, reply_words=50) as backend:
+            upstream = openai_upstream(AsyncOpenAI(base_url=backend.base_url, api_key="fake-key"), model="fake-model")
+            if fan_out:
+                upstream = FanOutUpstream(upstream, model="fake-model")
+            async with SSEStreamingServer(upstream) as server:
+                start = time.perf_counter()
+                results = await asyncio.gather(*(client(server.url, d, p) for d, p in arrivals))
+                elapsed = time.perf_counter() - start
+            complete = sum(r[2].count("word") == 50 for r in results)
+            label = "FanOutUpstream" if fan_out else "One stream each"
+            print(f"{label:16} upstream calls={backend.requests:4}  complete replies={complete}/{clients}"
+                  f"  wall={elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(_benchmark())
@@ -1,5 +1,4 @@
 import os
-import time
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -20,9 +19,8 @@ def demo_streaming():
         if chunk.choices[0].delta.content is not None:
             content = chunk.choices[0].delta.content
             print(content, end="", flush=True)
-            # Simulate a slight delay for better visual effect in CLI
-            time.sleep(0.05)
     print("\n\nStream finished.")
+    print("To serve this stream to many clients over HTTP, see sse_streaming_server.py")
 
 if __name__ == "__main__":
     demo_streaming()
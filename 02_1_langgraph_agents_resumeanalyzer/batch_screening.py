@@ -0,0 +1,295 @@
+import asyncio
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+
+from shared_models.job import Job
+from shared_models.resume import Resume
+from skill_prescreen import score_batch, resume_terms
+
+# ==========================================
+# 1. INPUT: STREAM RESUMES / JOBS
+# ==========================================
+
+def iter_documents(source):
+    """
+    Yields (id, text) pairs without loading everything into memory.
+    - A directory: every *.txt file (id = file name without extension)
+    - A .jsonl file: one {"id": ..., "text": ...} object per line
+    """
+    if os.path.isdir(source):
+        for path in sorted(glob.glob(os.path.join(source, "*.txt"))):
+            with open(path, "r", encoding="utf-8") as f:
+                yield os.path.splitext(os.path.basename(path))[0], f.read()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    doc = json.loads(line)
+                    yield str(doc["id"]), doc["text"]
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# ==========================================
+# 2. OUTPUT: INCREMENTAL, RESUMABLE WRITERS
+# ==========================================
+
+class JSONLResultWriter:
+    """Appends one line per screened pair; existing lines tell us what is already done."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def done_keys(self):
+        if not os.path.exists(self.path):
+            return set()
+        done = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Half-written last line from a crash
+                if not row.get("error"):  # Failed pairs are retried on the next run
+                    done.add((row["job_id"], row["resume_id"]))
+        return done
+
+    def write(self, rows):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in rows))
+
+class ParquetResultWriter:
+    """Writes one Parquet part file per chunk into a directory (needs `pyarrow`)."""
+
+    def __init__(self, directory):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa, self.pq = pa, pq
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.directory, "part-*.parquet")))
+
+    def done_keys(self):
+        done = set()
+        for path in self._parts():
+            table = self.pq.read_table(path)
+            errors = table.column("error").to_pylist() if "error" in table.column_names else [None] * len(table)
+            done.update((job_id, resume_id) for job_id, resume_id, error in zip(
+                table.column("job_id").to_pylist(), table.column("resume_id").to_pylist(), errors) if not error)
+        return done
+
+    def write(self, rows):
+        table = self.pa.Table.from_pylist(rows)
+        part = os.path.join(self.directory, f"part-{len(self._parts()):06d}.parquet")
+        # Write then rename, so a crash never leaves a truncated part behind
+        self.pq.write_table(table, part + ".tmp")
+        os.replace(part + ".tmp", part)
+
+# ==========================================
+# 3. THE BATCH PIPELINE
+# ==========================================
+
+async def extract_jobs(jobs, agent):
+    """Extract every posting exactly once, concurrently (cached ones not at all)."""
+    extractor = agent.llm.with_structured_output(Job)
+    ids = [job_id for job_id, _ in jobs]
+    structured = await asyncio.gather(*(
+        agent.extraction_cache.aget_or_extract(Job, text, lambda text=text: extractor.ainvoke(f"Extract job: {text}"))
+        for _, text in jobs))
+    return dict(zip(ids, structured))
+
+async def extract_resumes(texts, agent, concurrency):
+    """
+    Extract {resume_id: text} with at most `concurrency` calls in flight.
+    A failed extraction is returned as its exception instead of a Resume.
+    """
+    extractor = agent.llm.with_structured_output(Resume)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(text):
+        async with semaphore:
+            return await agent.extraction_cache.aget_or_extract(
+                Resume, text, lambda: extractor.ainvoke(f"Extract resume: {text}"))
+
+    structured = await asyncio.gather(*(one(text) for text in texts.values()), return_exceptions=True)
+    return dict(zip(texts, structured))
+
+async def screen(jobs_source, resumes_source, output, concurrency=16, chunk_size=64,
+                 output_format="jsonl", verbose=False):
+    """
+    Screens every resume against every job.
+
+    - Each job is extracted once, and each resume once per chunk; both are
+      passed to the graph as `structured_job`/`structured_resume`, so the
+      extractor node does no LLM work per pair.
+    - Resumes are streamed in chunks; each chunk runs through `app.abatch`
+      with `max_concurrency`, and its results are written before the next chunk.
+    - Pairs already present in the output are skipped, so an interrupted run
+      can simply be started again.
+    - A pair that fails (resume extraction or any graph node) is written with
+      its `error` and does not stop the batch; failed pairs are retried when
+      the run is started again.
+    """
+    import resume_analyzer_agent as agent
+
+    writer = ParquetResultWriter(output) if output_format == "parquet" else JSONLResultWriter(output)
+    done = writer.done_keys()
+    jobs = await extract_jobs(list(iter_documents(jobs_source)), agent)
+    stats = {"screened": 0, "failed": 0, "skipped": 0, "started": time.perf_counter()}
+
+    for chunk in chunked(iter_documents(resumes_source), chunk_size):
+        pairs = [(job_id, resume_id, text) for resume_id, text in chunk for job_id in jobs
+                 if (job_id, resume_id) not in done]
+        stats["skipped"] += len(chunk) * len(jobs) - len(pairs)  # Already in the output
+        if not pairs:
+            continue
+        # Each resume in the chunk is also extracted once, not once per job
+        resumes = await extract_resumes({resume_id: text for _, resume_id, text in pairs}, agent, concurrency)
+        failed = {(job_id, resume_id): resumes[resume_id] for job_id, resume_id, _ in pairs
+                  if isinstance(resumes[resume_id], Exception)}
+        pairs = [pair for pair in pairs if pair[:2] not in failed]
+        resumes = {resume_id: resume for resume_id, resume in resumes.items() if not isinstance(resume, Exception)}
+        # Score the whole chunk against each job at once; the graph's prescreen
+        # node reuses these scores and only sends the good ones to the LLM nodes
+        terms = {resume_id: resume_terms(resume) for resume_id, resume in resumes.items()}
+        scores = {}
+        for job_id in jobs:
+            ids = [resume_id for j, resume_id, _ in pairs if j == job_id]
+            tfidf = score_batch(jobs[job_id], [terms[r] for r in ids])["tfidf"] if ids else []
+            scores.update({(job_id, r): float(v) for r, v in zip(ids, tfidf)})
+        inputs = [{"raw_job_text": "", "raw_resume_text": text,
+                   "structured_job": jobs[job_id], "structured_resume": resumes[resume_id],
+                   "prescreen_score": scores[(job_id, resume_id)]}
+                  for job_id, resume_id, text in pairs]
+
+        # The nodes print a lot; keep batch output readable unless asked otherwise
+        quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            # One failing pair must not throw away the rest of the chunk
+            states = await agent.app.abatch(inputs, config={"max_concurrency": concurrency},
+                                            return_exceptions=True) if inputs else []
+        failed.update((pair[:2], state) for pair, state in zip(pairs, states) if isinstance(state, Exception))
+
+        rows = [{
+            "job_id": job_id,
+            "resume_id": resume_id,
+            "candidate": state["structured_resume"].name,
+            "job_title": state["structured_job"].title,
+            "prescreen_score": state["prescreen_score"],
+            "fit_analysis": state["fit_analysis"],
+            "gap_analysis_report": state["gap_analysis_report"],
+            "notification_status": state["notification_status"],
+            "error": None,
+        } for (job_id, resume_id, _), state in zip(pairs, states) if not isinstance(state, Exception)]
+        rows += [{
+            "job_id": job_id,
+            "resume_id": resume_id,
+            "candidate": None,
+            "job_title": jobs[job_id].title,
+            "prescreen_score": None,
+            "fit_analysis": None,
+            "gap_analysis_report": None,
+            "notification_status": None,
+            "error": repr(error),
+        } for (job_id, resume_id), error in failed.items()]
+        writer.write(rows)
+        stats["screened"] += len(rows) - len(failed)
+        stats["failed"] += len(failed)
+        elapsed = time.perf_counter() - stats["started"]
+        print(f"[batch] screened={stats['screened']} failed={stats['failed']} skipped={stats['skipped']} "
+              f"({stats['screened'] / elapsed:.1f} pairs/s)")
+    return stats
+
+# ==========================================
+# 4. BENCHMARK WITH A FAKE LLM
+# ==========================================
+
+class FakeLLM:
+    """Stands in for ChatOpenAI: fixed latency, mock Job/Resume objects, canned reports."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = 0
+
+    class _Message:
+        def __init__(self, content):
+            self.content = content
+
+    def with_structured_output(self, schema):
+        fake = self
+
+        class _Extractor:
+            def invoke(self, _):
+                fake.calls += 1
+                time.sleep(fake.latency)
+                return schema.mock()
+
+            async def ainvoke(self, _):
+                fake.calls += 1
+                await asyncio.sleep(fake.latency)
+                return schema.mock()
+        return _Extractor()
+
+    def invoke(self, _):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self._Message("Match: 72%. Missing: Kubernetes.")
+
+def benchmark(num_jobs=3, num_resumes=100, workdir="bench_screening"):
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")  # ChatOpenAI is replaced below
+    import resume_analyzer_agent as agent
+    from shared_models.extraction_cache import ExtractionCache
+    agent.llm = FakeLLM(latency=0.05)
+    # Mock resumes all score the same; disable the skill gate so the LLM path is measured
+    agent.PRESCREEN_THRESHOLD = 0.0
+
+    os.makedirs(workdir, exist_ok=True)
+    # Fresh extraction cache: the first run extracts, later runs hit the cache
+    cache_path = os.path.join(workdir, "extraction_cache.sqlite3")
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+    agent.extraction_cache = ExtractionCache(cache_path)
+    jobs_path = os.path.join(workdir, "jobs.jsonl")
+    resumes_path = os.path.join(workdir, "resumes.jsonl")
+    output = os.path.join(workdir, "results.jsonl")
+    with open(jobs_path, "w") as f:
+        f.writelines(json.dumps({"id": f"job{i}", "text": f"Posting {i}"}) + "\n" for i in range(num_jobs))
+    with open(resumes_path, "w") as f:
+        f.writelines(json.dumps({"id": f"cv{i}", "text": f"Resume {i}"}) + "\n" for i in range(num_resumes))
+
+    print(f"--- Batch Screening Benchmark ({num_jobs} jobs x {num_resumes} resumes, 50ms fake LLM) ---")
+    for concurrency in (1, 32):
+        if os.path.exists(output):
+            os.remove(output)
+        agent.llm.calls = 0
+        start = time.perf_counter()
+        stats = asyncio.run(screen(jobs_path, resumes_path, output, concurrency=concurrency, chunk_size=100))
+        print(f"concurrency={concurrency:3}: {stats['screened']} pairs in {time.perf_counter() - start:.1f}s, "
+              f"LLM calls={agent.llm.calls} (per-pair invoke would be {stats['screened'] * 4}), "
+              f"extraction cache hits={agent.extraction_cache.hits}")
+
+    # Running again resumes from the output file and has nothing left to do
+    stats = asyncio.run(screen(jobs_path, resumes_path, output))
+    print(f"Re-run: screened={stats['screened']} skipped={stats['skipped']} failed={stats['failed']}")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) >= 4:
+        # python batch_screening.py jobs.jsonl resumes_dir_or.jsonl results.jsonl
+        asyncio.run(screen(sys.argv[1], sys.argv[2], sys.argv[3]))
+    else:
+        benchmark()
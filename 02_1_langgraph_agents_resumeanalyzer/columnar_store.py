@@ -0,0 +1,318 @@
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Union, get_args, get_origin
+
+import numpy as np
+from pydantic import BaseModel
+
+# ==========================================
+# 1. COLUMNS
+# ==========================================
+
+# A string column is dictionary-encoded when it has at most this many distinct
+# values per row (skills, companies, schools...); free text is stored as one
+# UTF-8 buffer plus offsets instead.
+DICTIONARY_RATIO = 0.5
+
+class StrColumn:
+    def __init__(self):
+        self._values = []
+        self.nulls = None
+
+    def append(self, value):
+        self._values.append(value)
+
+    def finish(self):
+        values = self._values
+        if any(v is None for v in values):
+            self.nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            values = ["" if v is None else v for v in values]
+        vocab = dict.fromkeys(values)
+        if len(vocab) <= DICTIONARY_RATIO * len(values):
+            self.vocab = list(vocab)
+            index = {v: i for i, v in enumerate(self.vocab)}
+            self.codes = np.fromiter((index[v] for v in values), dtype=np.int32, count=len(values))
+        else:
+            self.vocab = None
+            encoded = [v.encode() for v in values]
+            self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+            self.data = b"".join(encoded)
+        del self._values
+
+    def __len__(self):
+        return len(self.codes) if self.vocab is not None else len(self.offsets) - 1
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        if self.vocab is not None:
+            return self.vocab[self.codes[i]]
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode()
+
+    def matches(self, value):
+        """Boolean mask of rows equal to `value` (case-insensitive)."""
+        value = value.lower()
+        if self.vocab is not None:
+            hits = [i for i, v in enumerate(self.vocab) if v.lower() == value]
+            mask = np.isin(self.codes, hits)
+        else:
+            mask = np.fromiter((self.get(i) is not None and self.get(i).lower() == value for i in range(len(self))),
+                               dtype=bool, count=len(self))
+        return mask if self.nulls is None else mask & ~self.nulls
+
+    @property
+    def nbytes(self):
+        if self.vocab is not None:
+            size = self.codes.nbytes + sys.getsizeof(self.vocab) + sum(sys.getsizeof(v) for v in self.vocab)
+        else:
+            size = self.offsets.nbytes + sys.getsizeof(self.data)
+        return size + (self.nulls.nbytes if self.nulls is not None else 0)
+
+class IntColumn:
+    def __init__(self):
+        self._values = []
+        self.nulls = None
+
+    def append(self, value):
+        self._values.append(value)
+
+    def finish(self):
+        values = self._values
+        if any(v is None for v in values):
+            self.nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            values = [0 if v is None else v for v in values]
+        self.values = np.array(values, dtype=np.int64)
+        del self._values
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return int(self.values[i])
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + (self.nulls.nbytes if self.nulls is not None else 0)
+
+class ListColumn:
+    """Ragged lists: row i holds child rows offsets[i]:offsets[i + 1]."""
+
+    def __init__(self, child):
+        self.child = child
+        self._lengths = []
+        self._nulls = []
+        self.nulls = None
+
+    def append(self, value):
+        self._nulls.append(value is None)
+        self._lengths.append(len(value or ()))
+        for item in value or ():
+            self.child.append(item)
+
+    def finish(self):
+        self.offsets = np.zeros(len(self._lengths) + 1, dtype=np.int64)
+        np.cumsum(self._lengths, out=self.offsets[1:])
+        if any(self._nulls):
+            self.nulls = np.array(self._nulls, dtype=bool)
+        del self._lengths, self._nulls
+        self.child.finish()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return [self.child.get(j) for j in range(self.offsets[i], self.offsets[i + 1])]
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.child.nbytes + (self.nulls.nbytes if self.nulls is not None else 0)
+
+class StructColumn:
+    """One child column per field of a Pydantic model."""
+
+    def __init__(self, model_cls):
+        self.model_cls = model_cls
+        self.children = {name: column_for(field.annotation) for name, field in model_cls.model_fields.items()}
+        self._length = 0
+
+    def append(self, obj):
+        self._length += 1
+        for name, child in self.children.items():
+            child.append(getattr(obj, name))
+
+    def finish(self):
+        for child in self.children.values():
+            child.finish()
+
+    def __len__(self):
+        return self._length
+
+    def get(self, i):
+        # The data was validated when the original models were built, so skip it here
+        return self.model_cls.model_construct(**{name: child.get(i) for name, child in self.children.items()})
+
+    @property
+    def nbytes(self):
+        return sum(child.nbytes for child in self.children.values())
+
+def column_for(annotation):
+    """Picks the column type for a field annotation (str, int, List[...], nested model, Optional[...])."""
+    if get_origin(annotation) is Union:
+        (annotation,) = [a for a in get_args(annotation) if a is not type(None)]
+    if get_origin(annotation) in (list, List):
+        return ListColumn(column_for(get_args(annotation)[0]))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return StructColumn(annotation)
+    if annotation is str:
+        return StrColumn()
+    if annotation is int:
+        return IntColumn()
+    raise TypeError(f"No column type for {annotation!r}")
+
+# ==========================================
+# 2. THE STORE
+# ==========================================
+
+class ColumnarStore:
+    """
+    Columnar copy of a list of Pydantic models (e.g. `Resume` or `Job`).
+
+    Nested lists become offset arrays, nested models become groups of columns,
+    so "work_experience.experience" is one int64 array across all resumes.
+    `store[i]` / `to_models()` rebuild the original objects.
+    """
+
+    def __init__(self, model_cls, models):
+        self.root = StructColumn(model_cls)
+        for model in models:
+            self.root.append(model)
+        self.root.finish()
+
+    def __len__(self):
+        return len(self.root)
+
+    def __getitem__(self, i):
+        return self.root.get(i)
+
+    def to_models(self):
+        return [self.root.get(i) for i in range(len(self))]
+
+    @property
+    def nbytes(self):
+        return self.root.nbytes
+
+    def _walk(self, path):
+        """Leaf column for a dotted path, plus the owning row of each of its values."""
+        column, rows = self.root, np.arange(len(self))
+        for name in path.split("."):
+            column = column.children[name]
+            while isinstance(column, ListColumn):
+                rows = np.repeat(rows, np.diff(column.offsets))
+                column = column.child
+        return column, rows
+
+    def column(self, path):
+        return self._walk(path)[0]
+
+    def sum_by_row(self, path):
+        """Sum of an int field per top-level row, e.g. total years per candidate."""
+        column, rows = self._walk(path)
+        return np.bincount(rows, weights=column.values, minlength=len(self))
+
+    def count_by_row(self, path):
+        """Number of values per top-level row, e.g. skills per candidate."""
+        _, rows = self._walk(path)
+        return np.bincount(rows, minlength=len(self))
+
+    def rows_with(self, path, value):
+        """Boolean mask of top-level rows having `value` anywhere under a str field."""
+        column, rows = self._walk(path)
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows[column.matches(value)]] = True
+        return mask
+
+    def value_counts(self, path):
+        """{value: occurrences} for a dictionary-encoded field, most common first."""
+        column = self.column(path)
+        counts = np.bincount(column.codes, minlength=len(column.vocab))
+        return {column.vocab[i]: int(counts[i]) for i in np.argsort(-counts)}
+
+def years_of_experience(store):
+    return store.sum_by_row("work_experience.experience")
+
+# ==========================================
+# 3. MEMORY BENCHMARK
+# ==========================================
+
+def make_resumes(n, seed=0):
+    from shared_models.resume import Resume
+
+    rng = random.Random(seed)
+    base = Resume.mock()
+    companies = [f"Company {i}" for i in range(2_000)]
+    skills = [f"Skill {i}" for i in range(500)] + base.skills
+    schools = [f"University {i}" for i in range(300)]
+    resumes = []
+    for i in range(n):
+        resume = base.model_copy(deep=True)
+        resume.name = f"Candidate {i}"
+        resume.skills = rng.sample(skills, 8)
+        for job in resume.work_experience:
+            job.company = rng.choice(companies)
+            job.experience = rng.randint(1, 10)
+        resume.education[0].school = rng.choice(schools)
+        resume.education[0].year = rng.randint(1990, 2024)
+        resumes.append(resume)
+    return resumes
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def benchmark(num_resumes=50_000):
+    from shared_models.job import Job
+
+    print(f"--- Columnar Store vs list[Resume] ({num_resumes:,} resumes) ---")
+    resumes, models_bytes = _traced(lambda: make_resumes(num_resumes))
+    start = time.perf_counter()
+    store, store_bytes = _traced(lambda: ColumnarStore(type(resumes[0]), resumes))
+    build_seconds = time.perf_counter() - start
+    print(f"list[Resume]:   {models_bytes / 2**20:8.1f} MiB")
+    print(f"ColumnarStore:  {store_bytes / 2**20:8.1f} MiB ({models_bytes / store_bytes:.1f}x smaller, "
+          f"built in {build_seconds:.1f}s)")
+
+    assert all(store[i] == resumes[i] for i in range(0, num_resumes, max(1, num_resumes // 1000)))
+    jobs = [Job.mock()]
+    assert ColumnarStore(Job, jobs).to_models() == jobs
+    print("Round-trip: OK (Resume and Job)")
+
+    start = time.perf_counter()
+    loop = [sum(w.experience for w in r.work_experience) for r in resumes]
+    loop_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    years = years_of_experience(store)
+    vector_seconds = time.perf_counter() - start
+    assert years.tolist() == loop
+    print(f"Years of experience: loop {loop_seconds * 1000:.1f} ms, vectorized {vector_seconds * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    mask = store.rows_with("skills", "CI/CD")
+    print(f"Candidates with 'CI/CD': {int(mask.sum()):,} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+    print(f"Top companies: {list(store.value_counts('work_experience.company'))[:3]}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,19 +1,36 @@
 import os
+import sys
+import time
 from typing import TypedDict, Optional, List
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
 
 # LangGraph & LangChain imports
 from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
-# Import our Pydantic models from our local modules folder
-from modules.job import Job
-from modules.resume import Resume
+# Import our Pydantic models from the shared_models package (pip install -e ../shared_models)
+from shared_models.job import Job
+from shared_models.resume import Resume
+from shared_models.extraction_cache import ExtractionCache
+from skill_prescreen import score_batch
+
+# Candidates whose skills barely overlap the job requirements (term cosine
+# below this) skip the matcher and gap analysis LLM calls entirely. The score
+# depends only on the job/resume pair, so single runs, batch chunks and the
+# streaming pre-screen all decide the same way.
+PRESCREEN_THRESHOLD = 0.1
 
 # Load environment variables (API Key etc.)
 load_dotenv()
 
+# How the matcher and gap analysis run after the pre-screen:
+# - "parallel":   matcher and gap_analyzer as one super-step, joined before the notifier
+# - "merged":     one structured-output call that returns both reports
+# - "sequential": matcher, then gap_analyzer (the original layout)
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "parallel")
+
 # ==========================================
 # 1. DEFINE THE STATE
 # ==========================================
@@ -25,6 +42,7 @@ class AgentState(TypedDict):
     # Processed Data
     structured_job: Optional[Job]
     structured_resume: Optional[Resume]
+    prescreen_score: Optional[float]
     
     # Analysis Reports
     fit_analysis: Optional[str]
@@ -36,6 +54,12 @@ class AgentState(TypedDict):
 # Create our LLM instance
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
+# Structured extractions keyed by a hash of the normalized text + schema version,
+# so re-screening a known resume against a new job skips its extraction entirely.
+# Kept next to this script (not in the cwd); the file is only created on first use.
+extraction_cache = ExtractionCache(os.getenv(
+    "EXTRACTION_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_cache.sqlite3")))
+
 # ==========================================
 # 2. DEFINE THE NODES (THE WORKERS)
 # ==========================================
@@ -47,13 +71,22 @@ def extraction_node(state: AgentState):
     """
     print("\n[Node] 🔍 EXTRACTOR: Converting raw text to objects...")
     
-    # Extract Job
-    job_extractor = llm.with_structured_output(Job)
-    job_data = job_extractor.invoke(f"Extract job: {state['raw_job_text']}")
+    # Extract Job (skipped when the caller already passed a structured job,
+    # e.g. batch screening extracts each posting once and reuses it)
+    job_data = state.get("structured_job")
+    if job_data is None:
+        job_extractor = llm.with_structured_output(Job)
+        job_data = extraction_cache.get_or_extract(
+            Job, state['raw_job_text'],
+            lambda: job_extractor.invoke(f"Extract job: {state['raw_job_text']}"))
     
     # Extract Resume
-    resume_extractor = llm.with_structured_output(Resume)
-    resume_data = resume_extractor.invoke(f"Extract resume: {state['raw_resume_text']}")
+    resume_data = state.get("structured_resume")
+    if resume_data is None:
+        resume_extractor = llm.with_structured_output(Resume)
+        resume_data = extraction_cache.get_or_extract(
+            Resume, state['raw_resume_text'],
+            lambda: resume_extractor.invoke(f"Extract resume: {state['raw_resume_text']}"))
     
     print(f" -> Found Job: {job_data.title}")
     print(f" -> Found Candidate: {resume_data.name}")
@@ -63,6 +96,27 @@ def extraction_node(state: AgentState):
         "structured_resume": resume_data
     }
 
+def prescreen_node(state: AgentState):
+    """
+    Worker 1.5: Deterministic skill-overlap score, no LLM involved.
+    Obvious non-fits get a canned report and go straight to the notifier.
+    """
+    score = state.get("prescreen_score")
+    if score is None:
+        score = float(score_batch(state["structured_job"], [state["structured_resume"]])["tfidf"][0])
+    print(f"\n[Node] 🧮 PRE-SCREEN: Skill overlap score {score:.2f}")
+
+    if score >= PRESCREEN_THRESHOLD:
+        return {"prescreen_score": score}
+    return {
+        "prescreen_score": score,
+        "fit_analysis": f"1. Match Percentage: {score * 100:.0f}%\n2. Decision Reasoning: Skills do not overlap the job requirements.",
+        "gap_analysis_report": "Most job requirements are missing from the resume; review the posting's requirements list.",
+    }
+
+def route_after_prescreen(state: AgentState):
+    return "analysis" if state["prescreen_score"] >= PRESCREEN_THRESHOLD else "notifier"
+
 def matcher_node(state: AgentState):
     """
     Worker 2: Analyzes fit between candidate and job.
@@ -111,6 +165,44 @@ def gap_analysis_node(state: AgentState):
     print(" -> Gap report generated sample suggestions.")
     return {"gap_analysis_report": gap_report}
 
+class AnalysisReport(BaseModel):
+    """Both reports from a single LLM call (used by the "merged" analysis mode)."""
+
+    fit_analysis: str = Field(description="Match Percentage (0-100%) and a brief Decision Reasoning.")
+    gap_analysis_report: str = Field(description="3 critical missing skills, each with a recommended course or certification.")
+
+    @classmethod
+    def mock(cls):
+        return cls(
+            fit_analysis="1. Match Percentage: 72%\n2. Decision Reasoning: Strong Python, missing Kubernetes.",
+            gap_analysis_report="Skill 1: Kubernetes - Recommended: Certified Kubernetes Administrator",
+        )
+
+def merged_analysis_node(state: AgentState):
+    """
+    Worker 2+3: Fit and gap analysis in one structured-output call.
+    """
+    print("\n[Node] ⚖️🎓 ANALYZER: Fit score and missing skills in one call...")
+    job = state["structured_job"]
+    resume = state["structured_resume"]
+
+    prompt = f"""
+    Act as a HR Specialist. Compare this Candidate to the Job.
+
+    CANDIDATE: {resume.name}, Summary: {resume.professional_summary}
+    CANDIDATE SKILLS: {resume.skills}
+    JOB: {job.title}, Requirements: {job.requirements}
+
+    Provide:
+    1. fit_analysis: A Match Percentage (0-100%) and a brief 'Decision Reasoning'.
+    2. gap_analysis_report: 3 CRITICAL SKILLS the candidate is missing, each formatted as
+       Skill 1: [Skill] - Recommended: [Course/Cert]
+    """
+
+    report = llm.with_structured_output(AnalysisReport).invoke(prompt)
+    print(" -> Fit and gap analysis completed.")
+    return {"fit_analysis": report.fit_analysis, "gap_analysis_report": report.gap_analysis_report}
+
 def notification_node(state: AgentState):
     """
     Worker 4: Simulates sending a final notification to the user.
@@ -138,29 +230,82 @@ def notification_node(state: AgentState):
 # 3. CONSTRUCT THE GRAPH
 # ==========================================
 
-workflow = StateGraph(AgentState)
+def build_graph(mode=ANALYSIS_MODE):
+    workflow = StateGraph(AgentState)
+
+    # Add Nodes
+    workflow.add_node("extractor", extraction_node)
+    workflow.add_node("prescreen", prescreen_node)
+    workflow.add_node("notifier", notification_node)
 
-# Add Nodes
-workflow.add_node("extractor", extraction_node)
-workflow.add_node("matcher", matcher_node)
-workflow.add_node("gap_analyzer", gap_analysis_node)
-workflow.add_node("notifier", notification_node)
+    workflow.add_edge(START, "extractor")
+    workflow.add_edge("extractor", "prescreen")
 
-# Add Edges (Linear Flow for this analysis)
-workflow.add_edge(START, "extractor")
-workflow.add_edge("extractor", "matcher")
-workflow.add_edge("matcher", "gap_analyzer")
-workflow.add_edge("gap_analyzer", "notifier")
-workflow.add_edge("notifier", END)
+    if mode == "merged":
+        workflow.add_node("analyzer", merged_analysis_node)
+        workflow.add_conditional_edges("prescreen", route_after_prescreen,
+                                       {"analysis": "analyzer", "notifier": "notifier"})
+        workflow.add_edge("analyzer", "notifier")
+    elif mode == "parallel":
+        # Both workers only read the structured job/resume, so they can run in the
+        # same super-step; the notifier waits for both to finish
+        workflow.add_node("matcher", matcher_node)
+        workflow.add_node("gap_analyzer", gap_analysis_node)
+        workflow.add_conditional_edges(
+            "prescreen",
+            lambda state: ["matcher", "gap_analyzer"] if route_after_prescreen(state) == "analysis" else "notifier",
+            ["matcher", "gap_analyzer", "notifier"])
+        workflow.add_edge(["matcher", "gap_analyzer"], "notifier")
+    elif mode == "sequential":
+        workflow.add_node("matcher", matcher_node)
+        workflow.add_node("gap_analyzer", gap_analysis_node)
+        workflow.add_conditional_edges("prescreen", route_after_prescreen,
+                                       {"analysis": "matcher", "notifier": "notifier"})
+        workflow.add_edge("matcher", "gap_analyzer")
+        workflow.add_edge("gap_analyzer", "notifier")
+    else:
+        raise ValueError(f"Unknown analysis mode: {mode!r}")
+
+    workflow.add_edge("notifier", END)
+    return workflow.compile()
 
 # Compile
-app = workflow.compile()
+app = build_graph()
 
 # ==========================================
 # 4. EXECUTE DEMO
 # ==========================================
 
+def benchmark(latency=0.3, runs=5):
+    """Per-candidate latency of each analysis mode with a fixed-latency fake LLM."""
+    import contextlib
+    import io
+    from batch_screening import FakeLLM
+
+    global llm
+    real_llm, llm = llm, FakeLLM(latency=latency)
+    inputs = {"raw_job_text": "", "raw_resume_text": "", "structured_job": Job.mock(),
+              "structured_resume": Resume.mock(), "prescreen_score": 1.0}
+    print(f"--- Analysis modes ({latency * 1000:.0f}ms per fake LLM call, {runs} runs) ---")
+    try:
+        for mode in ("sequential", "parallel", "merged"):
+            graph = build_graph(mode)
+            llm.calls = 0
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(runs):
+                    state = graph.invoke(inputs)
+            elapsed = (time.perf_counter() - start) / runs
+            assert state["fit_analysis"] and state["gap_analysis_report"]
+            print(f"{mode:10}: {elapsed * 1000:6.0f} ms per candidate, {llm.calls // runs} LLM calls")
+    finally:
+        llm = real_llm
+
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+        sys.exit()
+
     job_txt = """
     Job: Senior Cloud Architect @ Google. 
     Salary: $250k. 
@@ -0,0 +1,297 @@
+import json
+import mmap
+import random
+import struct
+import time
+from array import array
+
+import numpy as np
+
+from skill_prescreen import normalize_terms, job_terms
+
+# ==========================================
+# 1. TERMS PER FIELD
+# ==========================================
+
+# Postings are keyed "field:term", e.g. "skill:python" or "lang:spanish"
+FIELDS = ("skill", "tech", "cert", "lang")
+
+# How much a job term matching each field counts in top-k ranking
+FIELD_WEIGHTS = {"skill": 1.0, "tech": 0.8, "cert": 0.6, "lang": 0.3}
+
+def normalize_field(field, texts):
+    """The terms `texts` are indexed (and queried) under in `field`."""
+    if field == "lang":
+        return {text.strip().lower() for text in texts}
+    return normalize_terms(texts)
+
+def resume_fields(resume):
+    """{field: set of normalized terms} for one Resume."""
+    technologies = [t for project in resume.projects or [] for t in project.technologies]
+    return {
+        "skill": normalize_field("skill", resume.skills),
+        "tech": normalize_field("tech", technologies),
+        "cert": normalize_field("cert", [c.name for c in resume.certifications or []]),
+        "lang": normalize_field("lang", resume.languages or []),
+    }
+
+# ==========================================
+# 2. BUILDING THE INDEX
+# ==========================================
+
+MAGIC = b"SKIDX1\n"
+
+class SkillIndexBuilder:
+    """
+    Collects postings in memory and writes them to one file:
+
+        MAGIC | uint32 header length | JSON header | postings (uint32 doc numbers)
+              | id offsets (uint64, num_docs + 1) | ids (utf-8)
+
+    The header maps each "field:term" to (start, count) in the postings array.
+    Doc numbers are assigned in insertion order, so every posting list is sorted.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._ids = []
+
+    def add(self, doc_id, resume):
+        self.add_fields(doc_id, resume_fields(resume))
+
+    def add_fields(self, doc_id, fields):
+        """Same as `add`, for callers that already have {field: terms}."""
+        doc = len(self._ids)
+        self._ids.append(str(doc_id))
+        for field, terms in fields.items():
+            for term in terms:
+                key = f"{field}:{term}"
+                postings = self._postings.get(key)
+                if postings is None:
+                    postings = self._postings[key] = array("I")
+                postings.append(doc)
+
+    def save(self, path):
+        terms, start = {}, 0
+        for key in sorted(self._postings):
+            terms[key] = (start, len(self._postings[key]))
+            start += len(self._postings[key])
+        header = json.dumps({"num_docs": len(self._ids), "num_postings": start, "terms": terms}).encode()
+
+        ids = [i.encode() for i in self._ids]
+        offsets = np.zeros(len(ids) + 1, dtype=np.uint64)
+        offsets[1:] = np.cumsum([len(i) for i in ids], dtype=np.uint64)
+
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for key in sorted(self._postings):
+                self._postings[key].tofile(f)
+            f.write(offsets.astype("<u8").tobytes())
+            f.write(b"".join(ids))
+        return path
+
+# ==========================================
+# 3. QUERYING (MEMORY-MAPPED)
+# ==========================================
+
+class SkillIndex:
+    """
+    Read-only view of an index file. Opening it only parses the header; the
+    postings and ids stay on disk and are paged in by the OS as queries touch them.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a skill index")
+        pos = len(MAGIC)
+        (header_len,) = struct.unpack_from("<I", self._mm, pos)
+        header = json.loads(self._mm[pos + 4:pos + 4 + header_len])
+        pos += 4 + header_len
+
+        self.num_docs = header["num_docs"]
+        self.terms = header["terms"]
+        num_postings = header["num_postings"]
+        self._postings = np.frombuffer(self._mm, dtype="<u4", count=num_postings, offset=pos)
+        pos += 4 * num_postings
+        self._id_offsets = np.frombuffer(self._mm, dtype="<u8", count=self.num_docs + 1, offset=pos)
+        self._ids_start = pos + 8 * (self.num_docs + 1)
+
+    def close(self):
+        # NumPy views must go before the mmap can be closed
+        self._postings = self._id_offsets = None
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def postings(self, key):
+        """Sorted doc numbers for a "field:term" key (empty if unknown)."""
+        start, count = self.terms.get(key, (0, 0))
+        return self._postings[start:start + count]
+
+    def doc_id(self, doc):
+        start, end = int(self._id_offsets[doc]), int(self._id_offsets[doc + 1])
+        return self._mm[self._ids_start + start:self._ids_start + end].decode()
+
+    # Posting lists are sorted and unique, so set operations can skip np.unique's sort
+
+    @staticmethod
+    def _contains(sorted_list, values):
+        idx = np.searchsorted(sorted_list, values)
+        found = idx < len(sorted_list)
+        found[found] = sorted_list[idx[found]] == values[found]
+        return found
+
+    def _intersect(self, a, b):
+        small, large = (a, b) if len(a) <= len(b) else (b, a)
+        return small[self._contains(large, small)]
+
+    def _union(self, lists):
+        if len(lists) == 1:
+            return lists[0]
+        bitmap = np.zeros(self.num_docs, dtype=bool)
+        for postings in lists:
+            bitmap[postings] = True
+        return np.flatnonzero(bitmap).astype(np.uint32)
+
+    def _expand(self, term, fields):
+        """
+        'Python' -> postings of skill:python | tech:python; 'cert:Kubernetes'
+        searches one field. Terms are normalized the way resumes were indexed,
+        so 'Kubernetes', 'k8s' and 'CI/CD' find what resume_fields stored. A term
+        that normalizes to several terms ('machine learning engineer') needs all of them.
+        """
+        if ":" in term and term.split(":", 1)[0] in FIELDS:
+            field, term = term.split(":", 1)
+            fields = (field,)
+        per_field = {field: normalize_field(field, [term]) for field in fields}
+        words = set().union(*per_field.values())
+        if not words:
+            return np.empty(0, dtype=np.uint32)
+        result = None
+        for word in words:
+            postings = self._union([self.postings(f"{field}:{word}") for field in fields if word in per_field[field]])
+            result = postings if result is None else self._intersect(result, postings)
+        return result
+
+    def boolean(self, all_of=(), any_of=(), none_of=(), fields=("skill", "tech", "cert")):
+        """
+        Doc numbers matching every `all_of` term, at least one `any_of` term and
+        no `none_of` term. Plain terms are searched in `fields`; "field:term"
+        targets one field.
+        """
+        if not all_of and not any_of:
+            raise ValueError("boolean() needs at least one all_of or any_of term")
+        # Intersect the rarest lists first so the working set shrinks fastest
+        result = None
+        for postings in sorted((self._expand(t, fields) for t in all_of), key=len):
+            result = postings if result is None else self._intersect(result, postings)
+        if any_of:
+            union = self._union([self._expand(t, fields) for t in any_of])
+            result = union if result is None else self._intersect(result, union)
+        for term in none_of:
+            result = result[~self._contains(self._expand(term, fields), result)]
+        return result
+
+    def idf(self, key):
+        return np.log((1 + self.num_docs) / (1 + self.terms.get(key, (0, 0))[1])) + 1.0
+
+    def top_k(self, job, k=10, field_weights=None):
+        """
+        Ranks resumes by the IDF-weighted job terms they contain. Only the
+        postings of the job's terms are read from disk; scoring is one
+        float32 array over all resumes plus an argpartition for the top k.
+
+        Returns a list of (doc_id, score), best first.
+        """
+        if self.num_docs == 0 or k <= 0:
+            return []
+        field_weights = field_weights or FIELD_WEIGHTS
+        terms = job_terms(job) if not isinstance(job, set) else job
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in terms:
+            for field, weight in field_weights.items():
+                key = f"{field}:{term}"
+                if key in self.terms:
+                    # A posting list never repeats a doc, so plain fancy-index += is safe
+                    scores[self.postings(key)] += weight * self.idf(key)
+
+        k = min(k, self.num_docs)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.doc_id(doc), float(scores[doc])) for doc in best if scores[doc] > 0]
+
+# ==========================================
+# 4. BENCHMARK
+# ==========================================
+
+def _make_resume(rng, domain, certs, languages):
+    """A cheap Resume with the fields the index reads, written the way candidates write them."""
+    from shared_models.resume import Certification, Project, Resume
+
+    return Resume.model_construct(
+        skills=rng.sample(domain, 4),
+        projects=[Project.model_construct(technologies=rng.sample(domain, 2))],
+        certifications=[Certification.model_construct(name=c) for c in rng.sample(certs, rng.randint(0, 1))],
+        languages=rng.sample(languages, rng.randint(1, 2)),
+    )
+
+def benchmark(num_resumes=1_000_000, path="skill_index.bin"):
+    from shared_models.job import Job
+    from shared_models.resume import Resume
+
+    domains = [
+        ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "k8s", "REST APIs", "AWS", "Redis", "Golang"],
+        ["JavaScript", "React.js", "TypeScript", "CSS", "HTML", "Next.js", "Figma", "Node.js"],
+        ["SQL", "Pandas", "Spark", "Machine Learning", "ML", "TensorFlow", "Statistics", "Tableau"],
+        ["Photoshop", "Illustrator", "Branding", "Typography", "Sketch", "UX Research"],
+        ["Negotiation", "CRM", "Salesforce", "Lead Generation", "Cold Calling"],
+        ["Excel", "Financial Modeling", "Accounting", "SAP", "Budgeting", "Auditing", "CI/CD"],
+    ]
+    certs = ["AWS Certified Solutions Architect", "Certified Kubernetes Administrator", "PMP", "CPA",
+             "Certified ScrumMaster", "Google Cloud Professional"]
+    languages = ["English", "Spanish", "French", "German", "Mandarin"]
+    rng = random.Random(0)
+
+    builder = SkillIndexBuilder()
+    builder.add("jeff", Resume.mock())
+    start = time.perf_counter()
+    for i in range(num_resumes - 1):
+        builder.add(f"cv{i}", _make_resume(rng, rng.choice(domains), certs, languages))
+    builder.save(path)
+    print(f"--- Skill Index ({num_resumes:,} resumes) ---")
+    print(f"Build (resume_fields) + save: {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    index = SkillIndex(path)
+    print(f"Open (mmap):  {(time.perf_counter() - start) * 1000:.1f} ms, {len(index.terms)} terms")
+
+    # Queries are written like a recruiter would; they go through the same normalization
+    for term in ("Kubernetes", "cert:Kubernetes", "CI/CD", "Management"):
+        assert 0 in index.boolean(all_of=[term]), f"{term!r} does not find Resume.mock()"
+
+    def timed(label, fn, repeat=5):
+        fn()  # warm the page cache
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = fn()
+        print(f"{label:45} {(time.perf_counter() - start) / repeat * 1000:7.1f} ms  -> {len(result):,} hits")
+        return result
+
+    timed("Python AND Django", lambda: index.boolean(all_of=["Python", "Django"]))
+    timed("Python AND (Docker OR k8s) NOT AWS",
+          lambda: index.boolean(all_of=["Python"], any_of=["Docker", "k8s"], none_of=["AWS"]))
+    timed("cert:Kubernetes AND lang:Spanish", lambda: index.boolean(all_of=["cert:Kubernetes", "lang:Spanish"]))
+    top = timed("top-10 for Job.mock()", lambda: index.top_k(Job.mock(), k=10))
+    print(f"Best match: {top[0]}")
+    index.close()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,175 @@
+import random
+import re
+import time
+
+import numpy as np
+
+# ==========================================
+# 1. SKILL NORMALIZATION
+# ==========================================
+
+# Multi-word phrases are matched before single words, so "machine learning"
+# becomes one term instead of "machine" + "learning".
+SYNONYMS = {
+    "js": "javascript", "node.js": "nodejs", "node": "nodejs", "ts": "typescript",
+    "py": "python", "k8s": "kubernetes", "postgres": "postgresql", "psql": "postgresql",
+    "gcp": "google cloud", "google cloud platform": "google cloud", "amazon web services": "aws",
+    "ml": "machine learning", "dl": "deep learning", "ai": "artificial intelligence",
+    "nlp": "natural language processing", "llm": "large language model", "llms": "large language model",
+    "ci/cd": "cicd", "ci cd": "cicd", "continuous integration": "cicd",
+    "react.js": "react", "reactjs": "react", "golang": "go", "c sharp": "c#",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "or", "the", "of", "in", "on", "with", "for", "to", "at", "as", "by", "is",
+    "are", "be", "our", "your", "you", "we", "years", "year", "experience", "experienced",
+    "proficiency", "proficient", "knowledge", "strong", "skills", "skill", "familiarity",
+    "ability", "degree", "related", "field", "plus", "good", "excellent", "working", "using",
+}
+
+_PHRASES = sorted({p for pair in SYNONYMS.items() for p in pair if " " in p}, key=len, reverse=True)
+_TOKEN_RE = re.compile(r"[a-z0-9#+./]+")
+
+def stem(word):
+    """Very small suffix stripper: 'developing'/'developed'/'developers' -> 'develop'."""
+    for suffix in ("ations", "ation", "ments", "ment", "ings", "ing", "ers", "er", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+# Synonym targets go through the same stemming as ordinary tokens, so "k8s"
+# and "Kubernetes" both end up as "kubernet"
+CANONICAL = {alias: stem(target) if target.isalpha() else target for alias, target in SYNONYMS.items()}
+
+def normalize_terms(texts):
+    """Turns a list of skills/requirements into a set of canonical terms."""
+    terms = set()
+    for text in texts:
+        text = text.lower()
+        for phrase in _PHRASES:
+            if phrase in text:
+                terms.add(CANONICAL.get(phrase, phrase))
+                text = text.replace(phrase, " ")
+        for token in _TOKEN_RE.findall(text):
+            token = token.strip("./")
+            if len(token) < 2 and token not in ("c", "r"):
+                continue
+            if token in STOPWORDS or token[0].isdigit():
+                continue
+            if token in CANONICAL:
+                terms.add(CANONICAL[token])
+            else:
+                terms.add(stem(token) if token.isalpha() else token)
+    return terms
+
+def resume_terms(resume):
+    texts = list(resume.skills)
+    for project in resume.projects or []:
+        texts.extend(project.technologies)
+    return normalize_terms(texts)
+
+def job_terms(job):
+    return normalize_terms(job.requirements)
+
+# ==========================================
+# 2. VECTORIZED SCORING OVER A BATCH
+# ==========================================
+
+def fit_idf(resumes):
+    """
+    IDF weights {term: idf} from a fixed reference corpus of resumes (or term sets).
+
+    Fit once and pass the result to `score_batch`: weights fitted on whatever
+    batch is being scored would make a resume's score depend on its neighbours.
+    """
+    resume_sets = [resume_terms(r) if not isinstance(r, set) else r for r in resumes]
+    df = {}
+    for terms in resume_sets:
+        for term in terms:
+            df[term] = df.get(term, 0) + 1
+    return {term: float(np.log((1 + len(resume_sets)) / (1 + n)) + 1.0) for term, n in df.items()}
+
+def score_batch(job, resumes, idf=None):
+    """
+    Scores every resume against one job in a few matrix operations.
+
+    Returns a dict of NumPy arrays (one value per resume):
+    - overlap: number of job terms the resume covers
+    - jaccard: |R ∩ J| / |R ∪ J|
+    - tfidf:   cosine of binary term vectors weighted by the fixed `idf` map
+               (see `fit_idf`; unseen terms count as the rarest). Without one
+               every term weighs 1.
+
+    Each score depends only on the job and that resume, never on the rest of
+    the batch, so the same pair gets the same score alone or in a chunk.
+    """
+    job_set = job_terms(job)
+    resume_sets = [resume_terms(r) if not isinstance(r, set) else r for r in resumes]
+
+    vocab = {term: i for i, term in enumerate(sorted(job_set.union(*resume_sets)))}
+    R = np.zeros((len(resume_sets), len(vocab)), dtype=np.float32)
+    for row, terms in enumerate(resume_sets):
+        R[row, [vocab[t] for t in terms]] = 1.0
+    j = np.zeros(len(vocab), dtype=np.float32)
+    j[[vocab[t] for t in job_set]] = 1.0
+
+    overlap = R @ j
+    sizes = R.sum(axis=1)
+    union = sizes + j.sum() - overlap
+    jaccard = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+
+    if idf:
+        unseen = max(idf.values())
+        weights = np.array([idf.get(term, unseen) for term in vocab], dtype=np.float32)
+    else:
+        weights = np.ones(len(vocab), dtype=np.float32)
+    Rw, jw = R * weights, j * weights
+    norms = np.linalg.norm(Rw, axis=1) * np.linalg.norm(jw)
+    tfidf = np.divide(Rw @ jw, norms, out=np.zeros_like(overlap), where=norms > 0)
+
+    return {"overlap": overlap, "jaccard": jaccard, "tfidf": tfidf}
+
+def prescreen(job, resumes, threshold=0.1, metric="tfidf"):
+    """Returns (scores, mask) where mask marks the resumes worth an LLM call."""
+    scores = score_batch(job, resumes)
+    return scores, scores[metric] >= threshold
+
+# ==========================================
+# 3. BENCHMARK
+# ==========================================
+
+def benchmark(num_resumes=10_000, threshold=0.1):
+    from shared_models.job import Job
+
+    domains = {
+        "backend": ["Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "REST APIs", "AWS", "Redis"],
+        "frontend": ["JavaScript", "React", "TypeScript", "CSS", "HTML", "Next.js", "Figma"],
+        "data": ["SQL", "Pandas", "Spark", "Machine Learning", "TensorFlow", "Statistics", "Tableau"],
+        "design": ["Photoshop", "Illustrator", "Branding", "Typography", "Sketch", "UX Research"],
+        "sales": ["Negotiation", "CRM", "Salesforce", "Lead Generation", "Cold Calling"],
+        "finance": ["Excel", "Financial Modeling", "Accounting", "SAP", "Budgeting", "Auditing"],
+        "ops": ["Logistics", "Supply Chain", "Inventory", "Six Sigma", "Procurement"],
+        "health": ["Patient Care", "EMR", "Phlebotomy", "CPR", "Nursing"],
+        "legal": ["Contracts", "Litigation", "Compliance", "Legal Research"],
+        "hr": ["Recruiting", "Onboarding", "Payroll", "Employee Relations"],
+    }
+    rng = random.Random(0)
+    resume_sets = []
+    for _ in range(num_resumes):
+        skills = rng.sample(domains[rng.choice(list(domains))], 4) + [rng.choice(["Communication", "Teamwork", "Leadership"])]
+        resume_sets.append(normalize_terms(skills))
+
+    job = Job.mock()
+    start = time.perf_counter()
+    scores, mask = prescreen(job, resume_sets, threshold=threshold)
+    elapsed = time.perf_counter() - start
+
+    print(f"--- Skill Pre-screen ({num_resumes:,} resumes vs '{job.title}') ---")
+    print(f"Job terms: {sorted(job_terms(job))}")
+    print(f"Scored in {elapsed * 1000:.1f} ms ({num_resumes / elapsed:,.0f} resumes/s)")
+    print(f"Sent to LLM: {int(mask.sum()):,} / {num_resumes:,} "
+          f"({num_resumes / max(1, int(mask.sum())):.1f}x fewer matcher+gap calls)")
+
+
+if __name__ == "__main__":
+    benchmark()
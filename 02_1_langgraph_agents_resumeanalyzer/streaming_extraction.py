@@ -0,0 +1,170 @@
+import json
+import time
+from typing import List, Union, get_args, get_origin
+
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel
+
+from shared_models.job import Job
+from shared_models.resume import Resume
+from skill_prescreen import score_batch
+
+# ==========================================
+# 1. PARTIAL OBJECTS
+# ==========================================
+
+def _field_kind(annotation):
+    if get_origin(annotation) is Union:
+        annotation = next(a for a in get_args(annotation) if a is not type(None))
+    if get_origin(annotation) in (list, List):
+        item = get_args(annotation)[0]
+        return "list", item if isinstance(item, type) and issubclass(item, BaseModel) else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "model", annotation
+    return "value", None
+
+def partial_model(model_cls, data):
+    """
+    Builds a `model_cls` instance from an incomplete dict WITHOUT validation.
+    Fields that have not arrived yet are None (or [] for lists), nested models
+    are built the same way, so `resume.skills` or `resume.work_experience[0].company`
+    can be read while the JSON is still being generated.
+    """
+    values = {}
+    for name, field in model_cls.model_fields.items():
+        kind, sub_cls = _field_kind(field.annotation)
+        value = data.get(name) if isinstance(data, dict) else None
+        if kind == "list":
+            value = value if isinstance(value, list) else []
+            values[name] = [partial_model(sub_cls, v) for v in value] if sub_cls else value
+        elif kind == "model":
+            values[name] = partial_model(sub_cls, value) if value is not None else None
+        else:
+            values[name] = value
+    return model_cls.model_construct(**values)
+
+# The order we ask the LLM to write the keys in: short fields that drive
+# pre-screening first, long free text last. Other models use schema order.
+FIELD_ORDER = {
+    Resume: ("name", "skills", "projects", "certifications", "languages",
+             "professional_summary", "work_experience", "education"),
+    Job: ("title", "company", "requirements", "location", "salary", "employment_type",
+          "posted_date", "description", "responsibilities", "benefits"),
+}
+
+def field_order(model_cls):
+    return FIELD_ORDER.get(model_cls, tuple(model_cls.model_fields))
+
+def completed_fields(model_cls, data):
+    """
+    Top-level fields that are finished. Keys arrive in `field_order`, so a
+    field is complete (or was skipped) once any later field has started.
+    """
+    order = field_order(model_cls)
+    present = [i for i, name in enumerate(order) if name in data]
+    return set(order[:max(present)]) if present else set()
+
+# ==========================================
+# 2. STREAMING EXTRACTION
+# ==========================================
+
+def _extraction_chain(model_cls, llm):
+    parser = JsonOutputParser(pydantic_object=model_cls)
+    prompt = (f"Extract {model_cls.__name__.lower()} data from the text below. "
+              f"Write the JSON keys in this order: {', '.join(field_order(model_cls))}.\n"
+              f"{parser.get_format_instructions()}\n\nTEXT:\n")
+    chain = llm.bind(response_format={"type": "json_object"}) | parser
+    return prompt, chain
+
+def stream_extraction(model_cls, text, llm):
+    """
+    Like `llm.with_structured_output(model_cls).invoke(...)`, but yields
+    `(partial_object, completed_field_names)` every time more JSON arrives.
+    The last item is the fully validated model.
+    """
+    prompt, chain = _extraction_chain(model_cls, llm)
+    data = {}
+    for data in chain.stream(prompt + text):
+        yield partial_model(model_cls, data), completed_fields(model_cls, data)
+    yield model_cls.model_validate(data), set(model_cls.model_fields)
+
+async def astream_extraction(model_cls, text, llm):
+    prompt, chain = _extraction_chain(model_cls, llm)
+    data = {}
+    async for data in chain.astream(prompt + text):
+        yield partial_model(model_cls, data), completed_fields(model_cls, data)
+    yield model_cls.model_validate(data), set(model_cls.model_fields)
+
+def stream_prescreen(job, resume_text, llm, threshold=0.1):
+    """
+    Scores the resume against the job as soon as its skills and projects
+    are complete, i.e. everything `skill_prescreen` looks at.
+
+    Returns (score, resume, decided_after_seconds). Rejected candidates stop
+    the stream right there (no tokens are paid for the rest of the resume),
+    so `resume` is then the partial object; accepted ones are read to the end.
+    """
+    start = time.perf_counter()
+    score = decided_at = None
+    stream = stream_extraction(Resume, resume_text, llm)
+    for resume, done in stream:
+        # `resume.skills` guards against a model that ignored the key order
+        if score is None and {"skills", "projects"} <= done and resume.skills:
+            score = float(score_batch(job, [resume])["tfidf"][0])
+            decided_at = time.perf_counter() - start
+            if score < threshold:
+                stream.close()
+                return score, resume, decided_at
+    if score is None:
+        score = float(score_batch(job, [resume])["tfidf"][0])
+        decided_at = time.perf_counter() - start
+    return score, resume, decided_at
+
+# ==========================================
+# 3. DEMO WITH A FAKE STREAMING LLM
+# ==========================================
+
+def _fake_streaming_llm(content, token_delay):
+    """A chat model that streams `content` word by word, `token_delay` seconds per chunk."""
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+
+    class SlowFakeChatModel(GenericFakeChatModel):
+        def _stream(self, *args, **kwargs):
+            for chunk in super()._stream(*args, **kwargs):
+                time.sleep(token_delay)
+                yield chunk
+
+    return SlowFakeChatModel(messages=iter([AIMessage(content=content)]))
+
+def benchmark(token_delay=0.005):
+    job = Job.mock()
+    resume = Resume.mock()
+    data = resume.model_dump()
+    content = json.dumps({name: data[name] for name in field_order(Resume)}, indent=1)
+
+    # The non-streaming path has to wait for the whole JSON before parsing
+    llm = _fake_streaming_llm(content, token_delay)
+    start = time.perf_counter()
+    full = Resume.model_validate_json("".join(chunk.content for chunk in llm.stream("x")))
+    full_seconds = time.perf_counter() - start
+    full_score = float(score_batch(job, [full])["tfidf"][0])
+
+    print(f"--- Streaming extraction ({len(content.split())} chunks, {token_delay * 1000:.0f}ms each) ---")
+    print(f"Full extraction, then score:   {full_score:.2f} after {full_seconds:.2f}s")
+
+    first_name = None
+    start = time.perf_counter()
+    for partial, _ in stream_extraction(Resume, "x", _fake_streaming_llm(content, token_delay)):
+        if first_name is None and partial.name:
+            first_name = time.perf_counter() - start
+    print(f"Streaming: first field (name) after {first_name:.2f}s")
+
+    for threshold in (0.05, 0.5):
+        score, _, decided = stream_prescreen(job, "x", _fake_streaming_llm(content, token_delay), threshold)
+        outcome = "accepted, stream read to the end" if score >= threshold else "rejected, stream stopped"
+        print(f"Streaming pre-screen (threshold={threshold}): {score:.2f} after {decided:.2f}s ({outcome})")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -57,7 +57,13 @@ tokenizer.padding_side = "right" # Fix mixed precision issue
 # ==========================================
 # We use a tiny dataset for demonstration.
 # In reality, this should be a JSONL file with {"text": "Question... Answer..."}
-dataset = load_dataset("imdb", split="train[:1%]") # Using 1% of IMDB for speed
+# e.g. the file written by InteractionLogReader.export_training_jsonl()
+# in 00_misc_scripts/jsonl_log_reader.py from our logged LLM interactions.
+DATASET_FILE = None # "finetune_dataset.jsonl"
+if DATASET_FILE:
+    dataset = load_dataset("json", data_files=DATASET_FILE, split="train")
+else:
+    dataset = load_dataset("imdb", split="train[:1%]") # Using 1% of IMDB for speed
 
 def formatting_prompts_func(example):
     output_texts = []
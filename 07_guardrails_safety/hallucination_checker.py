@@ -0,0 +1,199 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
+
+# --- Structured verdicts ---
+
+class Verdict(BaseModel):
+    id: int = Field(description="The id of the question/answer pair")
+    hallucination: bool = Field(description="True if the answer contradicts the question/source or makes an obviously false claim")
+    reason: str = Field(description="One short sentence")
+    # Set by the checker, never by the model (kept out of the response schema):
+    # no verdict could be obtained, so the pair is neither flagged nor cleared
+    unverified: SkipJsonSchema[bool] = False
+
+class VerdictBatch(BaseModel):
+    verdicts: List[Verdict]
+
+SYSTEM_PROMPT = """You are a fact-checker. You get a JSON list of items with an id, a question, an AI generated answer and sometimes a source.
+For EVERY item, decide whether the answer contains an obvious contradiction or false claim (hallucination=true) or looks safe (hallucination=false), and give a brief reason.
+Return one verdict per id."""
+
+
+def _unverified(id, reason):
+    return Verdict(id=id, hallucination=False, reason=reason, unverified=True)
+
+def pair_key(question, answer, source=None):
+    """Cache key: hash of the exact question/answer (and source, if any)."""
+    return hashlib.sha256(json.dumps([question, answer, source]).encode()).hexdigest()
+
+# --- Cheap local prefilter ---
+
+STOPWORDS = frozenset("a an and are as at be by for from has have in is it its of on or that the this to was were will with".split())
+
+def _terms(text):
+    return {t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS}
+
+def lexical_overlap(answer, source):
+    """Share of the answer's words found in the source: 1.0 = every word is backed by the context."""
+    answer_terms = _terms(answer)
+    if not answer_terms:
+        return 1.0
+    return len(answer_terms & _terms(source)) / len(answer_terms)
+
+# --- The checker ---
+
+class HallucinationChecker:
+    """
+    Audits many (question, answer[, source]) pairs with few LLM calls.
+
+    - Pairs are packed `batch_size` at a time into one structured-output request.
+    - Up to `max_workers` batches run concurrently.
+    - Verdicts are cached by `pair_key`. Any dict-like object works as `cache`,
+      e.g. `shelve.open("verdicts")` to keep them across runs.
+    - With `min_overlap` set, pairs whose answer is mostly made of words from
+      their source pass locally; only the rest are sent to the LLM. Pairs
+      without a source are always sent: echoing the question proves nothing
+      ("Is the earth flat?" / "Yes, the earth is flat.").
+    - A pair whose batch failed, or that the model never answered, gets a
+      Verdict with `unverified=True`. Those are not cached.
+    """
+
+    def __init__(self, client, model="gpt-4o-mini", batch_size=20, max_workers=8, cache=None, min_overlap=None):
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else {}
+        self.min_overlap = min_overlap
+        self.stats = {"pairs": 0, "cached": 0, "prefiltered": 0, "llm_pairs": 0, "llm_calls": 0, "unverified": 0}
+        self._lock = threading.Lock()
+
+    def _ask(self, items):
+        """One LLM call for a list of (id, question, answer, source); returns {id: Verdict}."""
+        payload = [{"id": i, "question": q, "answer": a, **({"source": s} if s else {})} for i, q, a, s in items]
+        completion = self.client.beta.chat.completions.parse(
+            model=self.model,
+            temperature=0,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(payload)},
+            ],
+            response_format=VerdictBatch,
+        )
+        with self._lock:
+            self.stats["llm_calls"] += 1
+        wanted = {item[0] for item in items}
+        return {v.id: v for v in completion.choices[0].message.parsed.verdicts if v.id in wanted}
+
+    def _ask_batch(self, items):
+        """{id: Verdict} for every item; a failed call never takes the other batches down."""
+        try:
+            verdicts = self._ask(items)
+        except Exception as e:
+            return {item[0]: _unverified(item[0], f"Check failed: {e!r}") for item in items}
+        # A model occasionally skips an item in a long list: ask for those again, one by one
+        for item in items:
+            if item[0] not in verdicts:
+                try:
+                    verdicts.update(self._ask([item]))
+                except Exception as e:
+                    verdicts[item[0]] = _unverified(item[0], f"Check failed: {e!r}")
+                    continue
+                if item[0] not in verdicts:
+                    verdicts[item[0]] = _unverified(item[0], "The model returned no verdict.")
+        return verdicts
+
+    def check_many(self, pairs):
+        """Returns one Verdict per pair, in order; `pairs` holds (question, answer) or (question, answer, source)."""
+        pairs = [tuple(p) + (None,) * (3 - len(p)) for p in pairs]
+        self.stats["pairs"] += len(pairs)
+        results = [None] * len(pairs)
+        todo = {}  # key -> indices of identical pairs (only sent once)
+        for i, (question, answer, source) in enumerate(pairs):
+            key = pair_key(question, answer, source)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["cached"] += 1
+                results[i] = cached.model_copy(update={"id": i})
+            elif self.min_overlap is not None and source and (overlap := lexical_overlap(answer, source)) >= self.min_overlap:
+                self.stats["prefiltered"] += 1
+                results[i] = Verdict(id=i, hallucination=False, reason=f"Answer is backed by the source (overlap {overlap:.2f}).")
+            else:
+                todo.setdefault(key, []).append(i)
+
+        items = [(indices[0], *pairs[indices[0]]) for indices in todo.values()]
+        self.stats["llm_pairs"] += len(items)
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for verdicts in pool.map(self._ask_batch, batches):
+                for first, verdict in verdicts.items():
+                    key = pair_key(*pairs[first])
+                    if verdict.unverified:
+                        self.stats["unverified"] += len(todo[key])
+                    else:
+                        self.cache[key] = verdict
+                    for i in todo[key]:
+                        results[i] = verdict.model_copy(update={"id": i})
+        return results
+
+    def check(self, question, answer, source=None):
+        return self.check_many([(question, answer, source)])[0]
+
+# --- Benchmark with a fake client ---
+
+class _FakeClient:
+    """Mimics `client.beta.chat.completions.parse`: fixed latency per call plus a little per pair."""
+
+    def __init__(self, call_seconds=0.3, pair_seconds=0.01):
+        self.call_seconds = call_seconds
+        self.pair_seconds = pair_seconds
+        self.beta = self.chat = self.completions = self
+
+    def parse(self, model, messages, response_format, **kwargs):
+        from types import SimpleNamespace
+
+        items = json.loads(messages[-1]["content"])
+        time.sleep(self.call_seconds + self.pair_seconds * len(items))
+        parsed = response_format(verdicts=[
+            Verdict(id=item["id"], hallucination="Mars" in item["answer"], reason="fake") for item in items])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+
+def _make_pairs(n):
+    pairs = []
+    for i in range(n):
+        city = f"City{i}"
+        if i % 3 == 0:
+            pairs.append((f"What is the capital of Country{i}?", f"The capital of Country{i} is {city}."))
+        elif i % 3 == 1:
+            pairs.append((f"Who won cup number {i}?", f"Cup number {i} was won by Mars United."))
+        else:
+            source = f"{city} is an old town. {city} has a river and a castle."
+            pairs.append(("Summarize the source.", f"{city} has a river and a castle.", source))
+    return pairs
+
+def benchmark(num_pairs=1_000, call_seconds=0.3):
+    pairs = _make_pairs(num_pairs)
+    print(f"--- Hallucination audit ({num_pairs:,} pairs, {call_seconds * 1000:.0f} ms per LLM call) ---")
+    print(f"One free-text call per pair:         ~{num_pairs * (call_seconds + 0.01):.0f} s (estimated)")
+
+    for label, checker in [("batched + concurrent", HallucinationChecker(_FakeClient(call_seconds))),
+                           ("+ prefilter (0.8)", HallucinationChecker(_FakeClient(call_seconds), min_overlap=0.8))]:
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            verdicts = checker.check_many(pairs)
+            elapsed = time.perf_counter() - start
+            flagged = sum(v.hallucination for v in verdicts)
+            print(f"{label:21} {run}: {elapsed:6.2f} s, {flagged} flagged, stats={checker.stats}")
+            checker.stats = dict.fromkeys(checker.stats, 0)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,188 @@
+import inspect
+import random
+import string
+import time
+
+from guardrail_scanner import GuardrailScanner, GuardrailViolation, INJECTION_KEYWORDS, PII_PATTERNS
+
+# Rules for model OUTPUT: "secret" blocks the stream, PII is only recorded
+OUTPUT_KEYWORDS = {"secret": ["password", "api key", "begin private key"]}
+BLOCK_LABELS = ("secret",)
+
+
+class StreamGuard:
+    """
+    Scans an LLM response incrementally, one streamed delta at a time.
+
+    Each `feed(delta)` scans only the new text plus a short carry-over tail of
+    what came before, so a keyword split across chunks ("pass" + "word") is
+    still found, and the cost per delta stays constant instead of growing with
+    the response. Regex matches longer than `max_pattern_len` may be missed.
+    """
+
+    def __init__(self, scanner, block=BLOCK_LABELS, max_pattern_len=64):
+        self.scanner = scanner
+        self.block = set(block)
+        self.carry = max(scanner.keywords.max_len, max_pattern_len) - 1
+        self._tail = ""    # Last `carry` characters, already scanned once
+        self._offset = 0   # Position of _tail[0] in the whole response
+        self._seen = set()
+        self.spans = []
+        self.blocked = None
+
+    def feed(self, delta):
+        """Returns the new spans; sets `blocked` to the first span of a blocking rule."""
+        if not delta:
+            return []
+        window = self._tail + delta
+        new = []
+        for span in self.scanner.scan(window):
+            if span.end <= len(self._tail):
+                continue  # Entirely inside the old tail: reported by an earlier feed
+            span = span._replace(start=span.start + self._offset, end=span.end + self._offset)
+            # A regex match can grow as text arrives (bob@example.co -> .com); report it once
+            if (span.start, span.label) in self._seen:
+                continue
+            self._seen.add((span.start, span.label))
+            new.append(span)
+        if new:
+            self.spans.extend(new)
+            if self.blocked is None:
+                self.blocked = next((s for s in new if s.label in self.block), None)
+
+        cut = max(0, len(window) - self.carry)
+        self._offset += cut
+        self._tail = window[cut:]
+        if cut and self._seen:
+            self._seen = {key for key in self._seen if key[0] >= self._offset - self.carry}
+        return new
+
+
+def _delta(chunk):
+    # Usage-only and keep-alive chunks come with an empty `choices` list
+    return (chunk.choices[0].delta.content or "") if chunk.choices else ""
+
+def _holdback(guard, holdback):
+    # Enough to hide all but the last character of the longest keyword
+    return max(0, guard.scanner.keywords.max_len - 1) if holdback is None else holdback
+
+def guard_stream(stream, guard, holdback=None):
+    """
+    Wraps an OpenAI/LiteLLM `stream=True` response and yields text deltas.
+
+    When a blocking rule fires, the upstream stream is closed (no more tokens
+    are generated or paid for) and GuardrailViolation is raised. With
+    `holdback=N` the last N characters are held back until more text
+    arrives, so the start of a blocked phrase never reaches the user. The
+    default is the scanner's longest keyword minus one; pass 0 to stream
+    every delta as soon as it is scanned.
+    """
+    holdback = _holdback(guard, holdback)
+    pending = ""
+    try:
+        for chunk in stream:
+            delta = _delta(chunk)
+            guard.feed(delta)
+            if guard.blocked:
+                raise GuardrailViolation(guard.blocked)
+            pending += delta
+            if len(pending) > holdback:
+                yield pending[:len(pending) - holdback]
+                pending = pending[len(pending) - holdback:]
+        if pending:
+            yield pending
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+async def aguard_stream(stream, guard, holdback=None):
+    """Async version of `guard_stream` (AsyncOpenAI / litellm.acompletion streams)."""
+    holdback = _holdback(guard, holdback)
+    pending = ""
+    try:
+        async for chunk in stream:
+            delta = _delta(chunk)
+            guard.feed(delta)
+            if guard.blocked:
+                raise GuardrailViolation(guard.blocked)
+            pending += delta
+            if len(pending) > holdback:
+                yield pending[:len(pending) - holdback]
+                pending = pending[len(pending) - holdback:]
+        if pending:
+            yield pending
+    finally:
+        close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+        if close is not None:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+
+def output_scanner():
+    return GuardrailScanner(keywords={**OUTPUT_KEYWORDS, "injection": INJECTION_KEYWORDS}, patterns=PII_PATTERNS)
+
+
+# --- Benchmark with a fake token stream ---
+
+class _FakeStream:
+    """Yields OpenAI-shaped chunks; counts what was consumed and whether it was closed."""
+
+    class _Chunk:
+        def __init__(self, text):
+            self.choices = [type("Choice", (), {"delta": type("Delta", (), {"content": text})()})()]
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            if self.closed:
+                return
+            self.consumed += 1
+            yield self._Chunk(token)
+
+    def close(self):
+        self.closed = True
+
+def benchmark(num_tokens=20_000):
+    rng = random.Random(0)
+    tokens = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))) + " " for _ in range(num_tokens)]
+    scanner = output_scanner()
+
+    start = time.perf_counter()
+    guard = StreamGuard(scanner)
+    for token in tokens:
+        guard.feed(token)
+    per_token = (time.perf_counter() - start) / num_tokens * 1e6
+
+    # What scanning the accumulated text after every delta would cost
+    sample = tokens[:2_000]
+    start = time.perf_counter()
+    text = ""
+    for token in sample:
+        text += token
+        scanner.scan(text)
+    naive_per_token = (time.perf_counter() - start) / len(sample) * 1e6
+
+    print(f"--- Streaming output guard ({num_tokens:,} tokens) ---")
+    print(f"StreamGuard.feed:             {per_token:7.1f} us per token")
+    print(f"Re-scan whole text per token: {naive_per_token:7.1f} us per token (first 2,000 tokens only; grows with length)")
+
+    # "pass" + "word" split across chunks, half-way through the response
+    leak_at = num_tokens // 2
+    leaking = tokens[:leak_at] + ["your pass", "word is hunter2 "] + tokens[leak_at:]
+    stream = _FakeStream(leaking)
+    received = []
+    try:
+        for text in guard_stream(stream, StreamGuard(scanner)):
+            received.append(text)
+    except GuardrailViolation as e:
+        print(f"Blocked: {e} after {stream.consumed:,} of {len(leaking):,} chunks "
+              f"(upstream closed: {stream.closed}, 'pass' shown to user: {'pass' in ''.join(received)[-40:]})")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,9 +1,17 @@
+import json
 import os
 from openai import OpenAI
 from dotenv import load_dotenv
 
+# pip install -e ../llm_cache
+from llm_cache import CachedChatCompletions, ResponseCache, SQLiteCache
+
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Kept next to this script (not in the cwd); the file is only created on first use
+cache_path = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"))
+# The same request + context always gets the same diagram: served from memory/disk after the first call
+chat = CachedChatCompletions(client, ResponseCache(disk=SQLiteCache(cache_path)))
 
 def generate_complex_diagram(prompt: str, context: dict = None):
     """
@@ -26,12 +34,13 @@ def generate_complex_diagram(prompt: str, context: dict = None):
     if context:
         user_input += f"Added Context from follow-up questions: {json.dumps(context)}"
 
-    response = client.chat.completions.create(
+    response = chat.create(
         model="gpt-4o", # Using GPT-4o for complex architecture
         messages=[
             {"role": "system", "content": system_instruction},
             {"role": "user", "content": user_input}
-        ]
+        ],
+        temperature=0
     )
     
     mermaid_code = response.choices[0].message.content.replace("```mermaid", "").replace("```", "").strip()
@@ -5,8 +5,15 @@ from typing import List, Optional
 import os
 from dotenv import load_dotenv
 
+# pip install -e ../llm_cache
+from llm_cache import ResponseCache, SQLiteCache
+
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Kept next to this script (not in the cwd); the file is only created on first use
+cache_path = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"))
+# Parsed questionnaires are cached as JSON, so a repeated request costs no API call
+cache = ResponseCache(disk=SQLiteCache(cache_path))
 
 # --- DATA MODELS ---
 
@@ -30,16 +37,18 @@ def generate_followup_questions(user_request: str):
     print(f"User Request: {user_request}\n")
     print("AI is determining what clarifying questions to ask...")
     
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a diagramming assistant. Before generating a diagram, you must ask 2-3 clarifying questions to understand the scope, stages, and data types. Use 'text', 'checkbox', or 'radio' for question types."},
-            {"role": "user", "content": user_request}
-        ],
-        response_format=Questionnaire,
+    messages = [
+        {"role": "system", "content": "You are a diagramming assistant. Before generating a diagram, you must ask 2-3 clarifying questions to understand the scope, stages, and data types. Use 'text', 'checkbox', or 'radio' for question types."},
+        {"role": "user", "content": user_request}
+    ]
+    return cache.get_or_call(
+        "gpt-4o-mini", messages, {"temperature": 0, "response_format": Questionnaire.__name__},
+        call=lambda: client.beta.chat.completions.parse(
+            model="gpt-4o-mini", messages=messages, response_format=Questionnaire, temperature=0,
+        ).choices[0].message.parsed,
+        dump=lambda questionnaire: questionnaire.model_dump_json(),
+        load=Questionnaire.model_validate_json,
     )
-    
-    return completion.choices[0].message.parsed
 
 if __name__ == "__main__":
     request = "generate a image processing using machine learning"
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def make_key(model, messages, params):
+    """Stable hash of everything that determines the answer."""
+    blob = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+# --- Tier 1: in-memory LRU with TTL ---
+
+class MemoryLRUCache:
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# --- Tier 2: on-disk SQLite ---
+
+class SQLiteCache:
+    """
+    Persistent tier. Values are JSON strings; expired rows are ignored and overwritten.
+
+    Every `prune_every` writes (and when the file is opened) expired rows are
+    deleted and, past `max_rows`, the rows closest to expiry (the oldest, as
+    the TTL is fixed) go too. The file is opened on first use, not at import.
+    `path` has no default, so a script never drops a cache file in the cwd.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_rows=100_000, prune_every=1_000):
+        self.path = path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._writes = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        # Callers hold self._lock
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+            self._prune()
+        return self._conn
+
+    def get(self, key):
+        with self._lock:
+            row = self._db().execute("SELECT expires_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return row[1]
+
+    def delete(self, key):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            db.commit()
+
+    def set(self, key, value):
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, time.time() + self.ttl, value))
+            db.commit()
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._prune()
+
+    def prune(self):
+        """Deletes expired rows, then the oldest ones above `max_rows`; returns how many were removed."""
+        with self._lock:
+            self._db()
+            return self._prune()
+
+    def _prune(self):
+        removed = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),)).rowcount
+        (rows,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if rows > self.max_rows:
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY expires_at LIMIT ?)",
+                (rows - self.max_rows,)).rowcount
+        self._conn.commit()
+        return removed
+
+
+# --- Tier 3 (optional): semantic nearest neighbour ---
+
+class _VectorTable:
+    """
+    Unit vectors of one scope in a preallocated float32 matrix. Capacity doubles
+    when full (amortized O(1) inserts, no copy per entry); at `max_entries` the
+    oldest row is overwritten.
+    """
+
+    def __init__(self, dim, max_entries):
+        self.max_entries = max_entries
+        self.matrix = np.empty((min(64, max_entries), dim), dtype=np.float32)
+        self.values = []
+        self.count = 0
+        self.oldest = 0
+
+    def add(self, vector, value):
+        if self.count < self.max_entries:
+            if self.count == len(self.matrix):
+                grown = np.empty((min(2 * self.count, self.max_entries), self.matrix.shape[1]), dtype=np.float32)
+                grown[:self.count] = self.matrix
+                self.matrix = grown
+            slot = self.count
+            self.count += 1
+            self.values.append(value)
+        else:
+            slot = self.oldest
+            self.oldest = (slot + 1) % self.max_entries
+            self.values[slot] = value
+        self.matrix[slot] = vector
+
+    def nearest(self, vector):
+        """(similarity, value) of the closest stored vector."""
+        sims = self.matrix[:self.count] @ vector
+        best = int(sims.argmax())
+        return float(sims[best]), self.values[best]
+
+
+class SemanticCache:
+    """
+    Embedding lookup for near-duplicate prompts. `embed_fn(text) -> list[float]`.
+    Entries are scoped by (model, params) so a hit never crosses models.
+
+    `embed(messages)` is the expensive part; `get` and `set` take its result,
+    so a miss costs one embedding call, not two.
+    """
+
+    def __init__(self, embed_fn, threshold=0.95, max_entries=10_000):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._tables = {}  # scope -> _VectorTable
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _text(messages):
+        return "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+
+    def embed(self, messages):
+        v = np.asarray(self.embed_fn(self._text(messages)), dtype=np.float32)
+        return v / (np.linalg.norm(v) or 1.0)
+
+    def get(self, scope, vector):
+        with self._lock:
+            table = self._tables.get(scope)
+            if table is None:
+                return None
+            similarity, value = table.nearest(vector)
+        return value if similarity >= self.threshold else None
+
+    def set(self, scope, vector, value):
+        with self._lock:
+            table = self._tables.get(scope)
+            if table is None:
+                table = self._tables[scope] = _VectorTable(len(vector), self.max_entries)
+            table.add(vector, value)
+
+
+def openai_embedder(client, model="text-embedding-3-small"):
+    return lambda text: client.embeddings.create(model=model, input=text).data[0].embedding
+
+
+# --- The cache in front of the LLM call ---
+
+class ResponseCache:
+    """
+    Looks up memory -> disk -> semantic tiers before calling the model.
+
+    Only deterministic calls (temperature=0, no streaming, n=1) are cached unless
+    `cache_nondeterministic=True`; everything else bypasses the cache.
+
+    A disk entry that `load` rejects (e.g. written under an older response
+    schema) is treated as a miss: it is deleted and the model is called again.
+    """
+
+    def __init__(self, memory=None, disk=None, semantic=None, cache_nondeterministic=False):
+        self.memory = memory if memory is not None else MemoryLRUCache()
+        self.disk = disk
+        self.semantic = semantic
+        self.cache_nondeterministic = cache_nondeterministic
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "semantic_hits": 0, "misses": 0, "bypassed": 0, "load_errors": 0,
+                      "lookup_seconds": 0.0, "call_seconds": 0.0}
+
+    def cacheable(self, params):
+        if params.get("stream") or params.get("n", 1) != 1:
+            return False
+        return self.cache_nondeterministic or params.get("temperature") == 0
+
+    def get_or_call(self, model, messages, params, call, dump, load):
+        """
+        `call()` makes the real request; `dump(response) -> str` and `load(str) -> response`
+        convert responses for the disk tier.
+        """
+        if not self.cacheable(params):
+            self.stats["bypassed"] += 1
+            return call()
+
+        start = time.perf_counter()
+        key = make_key(model, messages, params)
+        scope = make_key(model, [], params)
+        response, tier, vector = self.memory.get(key), "memory", None
+        if response is None and self.disk is not None:
+            response, tier = self._load_disk(key, load), "disk"
+        if response is None and self.semantic is not None:
+            vector = self.semantic.embed(messages)  # Reused by semantic.set on a miss
+            response, tier = self.semantic.get(scope, vector), "semantic"
+        self.stats["lookup_seconds"] += time.perf_counter() - start
+
+        if response is not None:
+            self.stats[f"{tier}_hits"] += 1
+            self.memory.set(key, response)
+            return response
+
+        self.stats["misses"] += 1
+        start = time.perf_counter()
+        response = call()
+        self.stats["call_seconds"] += time.perf_counter() - start
+        self.memory.set(key, response)
+        if self.disk is not None:
+            self.disk.set(key, dump(response))
+        if self.semantic is not None:
+            self.semantic.set(scope, vector, response)
+        return response
+
+    def _load_disk(self, key, load):
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        try:
+            return load(raw)
+        except Exception:
+            self.stats["load_errors"] += 1
+            self.disk.delete(key)
+            return None
+
+    def snapshot(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["semantic_hits"]
+        lookups = hits + self.stats["misses"]
+        return {**self.stats, "hit_rate": round(hits / lookups, 3) if lookups else 0.0}
+
+
+class CachedChatCompletions:
+    """Drop-in for `client.chat.completions` (OpenAI SDK): `chat.create(model=..., messages=..., ...)`."""
+
+    def __init__(self, client, cache=None):
+        from openai.types.chat import ChatCompletion
+        self._client = client
+        self._load = ChatCompletion.model_validate_json
+        self.cache = cache if cache is not None else ResponseCache()
+
+    def create(self, model, messages, **params):
+        return self.cache.get_or_call(
+            model, messages, params,
+            call=lambda: self._client.chat.completions.create(model=model, messages=messages, **params),
+            dump=lambda r: r.model_dump_json(),
+            load=self._load,
+        )
+
+
+def cached_completion(cache, model, messages, **params):
+    """`litellm.completion` behind a ResponseCache."""
+    import litellm
+    return cache.get_or_call(
+        model, messages, params,
+        call=lambda: litellm.completion(model=model, messages=messages, **params),
+        dump=lambda r: r.model_dump_json(),
+        load=lambda raw: litellm.ModelResponse(**json.loads(raw)),
+    )
+
+
+if __name__ == "__main__":
+    # python -m llm_cache
+    # Demo with a fake, slow "LLM" so no API key is needed
+    def fake_llm(prompt):
+        time.sleep(0.2)
+        return f"Answer to: {prompt}"
+
+    cache = ResponseCache(disk=SQLiteCache("demo_llm_cache.sqlite3"))
+    messages = [{"role": "user", "content": "What is the capital of France?"}]
+    for attempt in range(3):
+        start = time.perf_counter()
+        cache.get_or_call("gpt-4o-mini", messages, {"temperature": 0},
+                          call=lambda: fake_llm(messages[0]["content"]), dump=json.dumps, load=json.loads)
+        print(f"temperature=0 call {attempt + 1}: {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+    cache.get_or_call("gpt-4o-mini", messages, {"temperature": 0.7},
+                      call=lambda: fake_llm(messages[0]["content"]), dump=json.dumps, load=json.loads)
+    print(f"Stats: {cache.snapshot()}")
@@ -0,0 +1,52 @@
+"""
+Import time and memory of the shared models, each measured in a fresh process.
+
+    python measure_import.py
+
+Pydantic itself is imported and warmed up before the clock starts, so the
+numbers are only what our models add.
+"""
+import subprocess
+import sys
+
+CHILD = r'''
+import time, tracemalloc
+from pydantic import BaseModel, Field
+
+class _Warmup(BaseModel):
+    x: int = Field(description="x")
+_Warmup(x=1); _Warmup.model_json_schema()
+
+def rss():
+    return int(open("/proc/self/statm").read().split()[1]) * 4096
+
+rss_before = rss()
+if TRACE:
+    tracemalloc.start()
+start = time.perf_counter()
+from shared_models import Job, Resume
+import_ms = (time.perf_counter() - start) * 1000
+traced = tracemalloc.get_traced_memory()[0] if TRACE else 0
+
+start = time.perf_counter()
+Job.mock(); Resume.mock(); Job.model_json_schema(); Resume.model_json_schema()
+first_use_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+Resume.model_json_schema()
+schema_us = (time.perf_counter() - start) * 1e6
+print(import_ms, first_use_ms, schema_us, traced, rss() - rss_before)
+'''
+
+def run(trace):
+    out = subprocess.run([sys.executable, "-c", f"TRACE = {trace}\n" + CHILD],
+                         capture_output=True, text=True, check=True).stdout
+    return [float(v) for v in out.split()]
+
+if __name__ == "__main__":
+    runs = [run(False) for _ in range(5)]
+    import_ms, first_use_ms, schema_us, _, rss = [sorted(col)[2] for col in zip(*runs)]
+    traced = run(True)[3]
+    print(f"import:            {import_ms:6.1f} ms")
+    print(f"first use:         {first_use_ms:6.1f} ms (builds validators + JSON schema)")
+    print(f"cached schema:     {schema_us:6.0f} us per model_json_schema() call")
+    print(f"memory at import:  {traced / 1024:6.0f} KiB traced, {rss / 1024:.0f} KiB RSS after first use")
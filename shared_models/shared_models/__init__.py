@@ -0,0 +1,25 @@
+"""
+Pydantic models shared by the tutorial folders (Job, Resume, ...) plus the
+helpers that work on them. Submodules are imported on first attribute access,
+so `from shared_models import Job` does not pay for resume.py or SQLite.
+"""
+import importlib
+
+_EXPORTS = {
+    "Job": "job",
+    "Resume": "resume",
+    "WorkExperience": "resume",
+    "Education": "resume",
+    "Certification": "resume",
+    "Project": "resume",
+    "ExtractionCache": "extraction_cache",
+    "load_many": "bulk",
+    "dump_many": "bulk",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'shared_models' has no attribute {name!r}")
+    return getattr(importlib.import_module(f"shared_models.{_EXPORTS[name]}"), name)
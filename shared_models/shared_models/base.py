@@ -0,0 +1,26 @@
+import copy
+
+from pydantic import BaseModel, ConfigDict
+
+_json_schemas = {}
+
+
+class SharedModel(BaseModel):
+    """
+    Base class for the shared models.
+
+    - `defer_build=True`: the core validator/serializer is built on first use
+      instead of at import, so importing the package stays cheap.
+    - `model_json_schema()` is generated once per class. `with_structured_output`
+      asks for it on every call and callers may mutate it, so each call gets a copy.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs):
+        if args or kwargs:
+            return super().model_json_schema(*args, **kwargs)
+        if cls not in _json_schemas:
+            _json_schemas[cls] = super().model_json_schema()
+        return copy.deepcopy(_json_schemas[cls])
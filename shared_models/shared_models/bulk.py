@@ -0,0 +1,81 @@
+import gc
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List
+
+from pydantic import TypeAdapter
+
+
+@contextmanager
+def gc_paused():
+    """
+    Building thousands of nested models allocates millions of objects, which
+    keeps triggering the cyclic GC for nothing (models have no cycles). Pausing
+    it for the batch is the single biggest win for bulk loading.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+@lru_cache(maxsize=None)
+def list_adapter(model_cls):
+    """TypeAdapter(list[model_cls]), built once per model (building the validator is the slow part)."""
+    return TypeAdapter(List[model_cls])
+
+def _is_jsonl(data):
+    return not data.lstrip().startswith(b"[")
+
+def load_many(model_cls, data, strict=False):
+    """
+    Validates many objects in one go.
+
+    `data` is a JSON array (bytes/str), JSONL bytes (one object per line) or a
+    list of dicts. `strict=True` turns off type coercion ("5" is no longer
+    accepted for an int): right for data we produced ourselves.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    with gc_paused():
+        if isinstance(data, bytes) and _is_jsonl(data):
+            # Validating line by line avoids building one huge array first
+            return [model_cls.model_validate_json(line, strict=strict) for line in data.splitlines() if line.strip()]
+        if isinstance(data, bytes):
+            return list_adapter(model_cls).validate_json(data, strict=strict)
+        return list_adapter(model_cls).validate_python(data, strict=strict)
+
+def dump_many(model_cls, objs):
+    """JSON array bytes for a list of models (the inverse of `load_many`)."""
+    return list_adapter(model_cls).dump_json(objs)
+
+
+if __name__ == "__main__":
+    # python -m shared_models.bulk
+    from shared_models.resume import Resume
+
+    n = 20_000
+    resumes = [Resume.mock() for _ in range(n)]
+    lines = [r.model_dump_json().encode() for r in resumes]
+    jsonl = b"\n".join(lines)
+    array = dump_many(Resume, resumes)
+    list_adapter(Resume)  # Build the validator outside the timings
+
+    def timed(label, fn, repeat=5):
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        assert result == resumes
+        print(f"{label:42} {n / sorted(times)[repeat // 2]:10,.0f} resumes/s")
+
+    print(f"--- Bulk Resume ingest ({n:,} objects, {len(array) / 2**20:.1f} MiB JSON) ---")
+    timed("model_validate_json per object", lambda: [Resume.model_validate_json(line) for line in lines])
+    timed("load_many (JSON array)", lambda: load_many(Resume, array))
+    timed("load_many (JSONL)", lambda: load_many(Resume, jsonl))
+    timed("load_many (JSONL, strict)", lambda: load_many(Resume, jsonl, strict=True))
@@ -0,0 +1,104 @@
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+
+
+def normalize_text(text):
+    """Same document, same key: unify unicode forms and collapse all whitespace."""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def schema_version(model_cls):
+    """
+    Hash of the model's JSON schema plus the source of the module that defines it.
+    Any change to job.py or resume.py (fields, descriptions,
+    validators) produces a new version, so stale cache entries are never read.
+    """
+    source = inspect.getsource(sys.modules[model_cls.__module__])
+    schema = json.dumps(model_cls.model_json_schema(), sort_keys=True)
+    return hashlib.sha256((schema + source).encode()).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """
+    Persistent cache of structured extraction results (SQLite).
+
+    Key: (model name, schema version, sha256 of the normalized raw text).
+    Value: the Pydantic model serialized as JSON.
+
+    The database is opened on first use, so creating a cache at import time
+    does not touch the disk.
+    """
+
+    def __init__(self, path="extraction_cache.sqlite3"):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self):
+        # Callers hold self._lock
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS extractions (
+                kind TEXT, version TEXT, text_hash TEXT, value TEXT,
+                PRIMARY KEY (kind, version, text_hash))""")
+        return self._conn
+
+    def _version(self, model_cls):
+        kind = model_cls.__name__
+        if kind not in self._versions:
+            self._versions[kind] = schema_version(model_cls)
+            # Entries written under an older schema can never be hit again
+            with self._lock:
+                db = self._db()
+                db.execute("DELETE FROM extractions WHERE kind = ? AND version <> ?", (kind, self._versions[kind]))
+                db.commit()
+        return kind, self._versions[kind]
+
+    @staticmethod
+    def text_hash(text):
+        return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+    def get(self, model_cls, text):
+        kind, version = self._version(model_cls)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT value FROM extractions WHERE kind = ? AND version = ? AND text_hash = ?",
+                (kind, version, self.text_hash(text))).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return model_cls.model_validate_json(row[0])
+
+    def put(self, model_cls, text, obj):
+        kind, version = self._version(model_cls)
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                       (kind, version, self.text_hash(text), obj.model_dump_json()))
+            db.commit()
+
+    def get_or_extract(self, model_cls, text, extract):
+        """Return the cached object, or call `extract()` and remember its result."""
+        obj = self.get(model_cls, text)
+        if obj is None:
+            obj = extract()
+            self.put(model_cls, text, obj)
+        return obj
+
+    async def aget_or_extract(self, model_cls, text, aextract):
+        obj = self.get(model_cls, text)
+        if obj is None:
+            obj = await aextract()
+            self.put(model_cls, text, obj)
+        return obj
@@ -1,7 +1,9 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
 
-class Job(BaseModel):
+from shared_models.base import SharedModel
+
+class Job(SharedModel):
     title: str = Field(description="Job title or position.")
     company: str = Field(description="The company name.")
     location: Optional[str] = Field(description="Location of the job.")
@@ -1,14 +1,16 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import Field, field_validator
 
-class WorkExperience(BaseModel):
+from shared_models.base import SharedModel
+
+class WorkExperience(SharedModel):
     job_title: str = Field(description="Job title or position.")
     company: str = Field(description="The company name.")
     experience: int = Field(description="Years of experience in the job.")
     responsibilities: List[str] = Field(description="List of responsibilities in the job.")
     location: Optional[str] = Field(description="Work location.")
 
-class Education(BaseModel):
+class Education(SharedModel):
     degree: str = Field(description="Degree obtained.")
     school: str = Field(description="The university name.")
     major: str = Field(description="Major subject.")
@@ -21,18 +23,18 @@ class Education(BaseModel):
             return 0
         return v
 
-class Certification(BaseModel):
+class Certification(SharedModel):
     name: str = Field(description="Name of the certification.")
     issuer: str = Field(description="Organization that issued the certification.")
     year: Optional[int] = Field(description="Year obtained.")
 
-class Project(BaseModel):
+class Project(SharedModel):
     name: str = Field(description="Project name.")
     description: str = Field(description="Brief overview of the project.")
     technologies: List[str] = Field(description="Technologies used in the project.")
     link: Optional[str] = Field(description="URL to the project or repository.")
 
-class Resume(BaseModel):
+class Resume(SharedModel):
     """Structured resume data."""
 
     name: str = Field(description="Name of the person")